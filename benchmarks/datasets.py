@@ -0,0 +1,18 @@
+"""
+Data sets of the benchmarks
+"""
+
+import pathlib
+
+
+def read_smart_drug_data():
+    """Read the smart drug data"""
+    base_directory = pathlib.Path(__file__).parent.parent.resolve()
+    groups = []
+    for group in ("treatment", "placebo"):
+        ifname = base_directory.joinpath(
+            "data", "smart_drug_data_{}_group.dat".format(group),
+        )
+        with open(ifname, "r") as fobj:
+            groups.append(tuple(int(val.strip()) for val in fobj.readlines()))
+    return groups
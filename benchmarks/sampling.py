@@ -0,0 +1,87 @@
+"""
+Benchmark: uniform vs stratified sampling of the data permutations
+
+Compares the Monte Carlo standard error of the p value of the two sampling
+schemes, i.e., `sampling='uniform'` and `sampling='stratified'`. For each
+data set, the randomization test is repeated with different seeds, and the
+standard deviation of the p values is measured. Since the standard error
+decreases with the square root of the number of permutations N, the number
+of permutations needed for a target standard error follows from
+
+    N_target = N * (standard deviation / target)^2.
+
+The uniform scheme reports (1 + successes) / N, which overestimates the
+p value by (1 - p) / N; the bias column shows the mean deviation from the
+exact p value of the systematic approach (if available).
+
+"""
+
+import math
+import random
+from statistics import mean, stdev
+from randtest import randtest
+from datasets import read_smart_drug_data
+
+# Row of the results table
+ROW = "{:<12}{:>10.4f}{:>12}{:>10.4f}{:>10.4f}{:>12.5f}{:>14d}"
+
+
+def shifted_normal_data(size, effect, seed=1):
+    """Two groups of normal data, group A shifted by `effect`"""
+    rng = random.Random(seed)
+    group_a = tuple(rng.gauss(effect, 1.0) for _ in range(size))
+    group_b = tuple(rng.gauss(0.0, 1.0) for _ in range(size))
+    return group_a, group_b
+
+
+def main(nperm=2000, repetitions=100, target=0.001):
+    """Main function"""
+    print(__doc__)
+    data_sets = [
+        ("normal 9+9", shifted_normal_data(9, 1.0), True),
+        ("normal 9+9", shifted_normal_data(9, 1.6), True),
+        ("smart drug", read_smart_drug_data(), False),
+    ]
+    print(
+        "{:<12}{:>10}{:>12}{:>10}{:>10}{:>12}{:>14}".format(
+            "data",
+            "exact p",
+            "sampling",
+            "mean p",
+            "bias",
+            "std. dev.",
+            "N(se={:g})".format(target),
+        )
+    )
+    for name, (group_a, group_b), systematic in data_sets:
+        exact = math.nan
+        if systematic:
+            exact = randtest(group_a, group_b, num_permutations=-1).p_value
+        for sampling in ("uniform", "stratified"):
+            p_values = [
+                randtest(
+                    group_a,
+                    group_b,
+                    num_permutations=nperm,
+                    seed=seed,
+                    backend="threads",
+                    sampling=sampling,
+                ).p_value
+                for seed in range(repetitions)
+            ]
+            deviation = stdev(p_values)
+            print(
+                ROW.format(
+                    name,
+                    exact,
+                    sampling,
+                    mean(p_values),
+                    mean(p_values) - exact,
+                    deviation,
+                    math.ceil(nperm * (deviation / target) ** 2),
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
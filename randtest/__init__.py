@@ -1,7 +1,9 @@
 """
 Randtest module: Randomization tests for two-sample comparison
 
-This module implements a randomization test for two independent groups.
+This module implements a randomization test for two independent groups,
+for paired data, for k independent groups, and for the association between
+two variables.
 
 Based on:
 
@@ -9,7 +11,14 @@ E. Edgington and P. Onghena, Randomization Tests, 4th ed.
     Boca Raton, FL: Chapman & Hall/CRC, Taylor & Francis Group, 2007.
 """
 
-from .base import randtest
+from .base import randtest, plan_randtest
+from .paired import randtest_paired
+from .ksample import randtest_ksample
+from .ci import randtest_ci
+from .correlation import randtest_corr
+from .power import randtest_power
+from .incremental import IncrementalRandTest
+from .specs import StatisticSpec, register_statistic
 
 __author__ = "estripling"
 __email__ = "estripling042@gmail.com"
@@ -2,6 +2,7 @@
 argparse boilerplate code
 """
 
+import os
 import ast
 import argparse
 import textwrap
@@ -15,7 +16,11 @@ def read_data(ifname):
     return data
 
 
-def argparse_cli(description):
+def argparse_cli(
+    description,
+    help_a="file name group A data.",
+    help_b="file name group B data.",
+):
     """argparse boilerplate code"""
     parser = argparse.ArgumentParser(description=textwrap.dedent(description))
     parser.add_argument(
@@ -47,6 +52,14 @@ def argparse_cli(description):
         default=1,
         help="number of jobs (default: 1).",
     )
+    parser.add_argument(
+        "-b",
+        metavar="backend",
+        type=str,
+        choices=["processes", "threads"],
+        default="processes",
+        help="worker pool (default: 'processes').",
+    )
     parser.add_argument(
         "-l",
         metavar="log_level",
@@ -64,9 +77,73 @@ def argparse_cli(description):
     )
 
     parser.add_argument(
-        "fname_data_A", type=str, help="file name group A data.",
+        "fname_data_A", type=str, help=help_a,
     )
     parser.add_argument(
-        "fname_data_B", type=str, help="file name group B data.",
+        "fname_data_B", type=str, help=help_b,
+    )
+    return parser
+
+
+def add_tail_approximation(parser):
+    """Add the optional tail approximation flag"""
+    parser.add_argument(
+        "--tail-approximation",
+        action="store_true",
+        help="approximate small p values with a generalized Pareto tail.",
     )
     return parser
+
+
+def add_planner(parser):
+    """Add the optional time budget and dry run flags"""
+    parser.add_argument(
+        "--max-seconds",
+        metavar="max_seconds",
+        type=float,
+        default=None,
+        help="time budget in seconds: choose method, number of permutations"
+        + " and jobs automatically (default: None).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="print the plan of the randomization test without running it.",
+    )
+    return parser
+
+
+def add_client(parser):
+    """Add the optional server flag (client mode)"""
+    parser.add_argument(
+        "--server",
+        metavar="socket",
+        type=str,
+        default=None,
+        help="send the test to the randtest-serve instance listening on the"
+        + " Unix socket, which decides on the number of jobs, the backend,"
+        + " and the log level (default: None, run locally).",
+    )
+    return parser
+
+
+def check_client(parser, args):
+    """
+    Reject the options of a local run in client mode: the server decides on
+    the number of jobs, the backend, and the log level
+    """
+    if args.server is None or getattr(args, "dry_run", False):
+        return
+    for name in ("n", "b", "l"):
+        if getattr(args, name) != parser.get_default(name):
+            parser.error(
+                "argument -{}: not allowed with argument --server".format(name)
+            )
+
+
+def data_files(args) -> list:
+    """Absolute file names of the data, such that the server finds them"""
+    return [
+        os.path.abspath(args.fname_data_A),
+        os.path.abspath(args.fname_data_B),
+    ]
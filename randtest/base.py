@@ -11,13 +11,45 @@ Allows for user-defined:
 
 """
 
+import sys
+import math
+import heapq
+import queue
 import random
 import logging
 import functools
+import threading
 import multiprocessing as mp
+from multiprocessing.pool import ThreadPool
 from types import FunctionType, GeneratorType
-from itertools import combinations
+from itertools import combinations, islice, product
 from statistics import mean
+from .mcts import arithmetic_mean
+from .tail import TAIL_SIZE, orient, approximate_p_value
+from .planner import plan
+from .specs import (
+    ANTISYMMETRIC,
+    SUM_BASED,
+    StatisticSpec,
+    register_statistic,
+    get_statistic,
+    has_capability,
+)
+
+# Number of data permutations evaluated per task
+BLOCK_SIZE = 1000
+
+# Maximum number of outstanding tasks per job
+INFLIGHT_PER_JOB = 4
+
+# Worker pools to carry out the computation
+BACKENDS = ("processes", "threads")
+
+# Sampling schemes of the Monte Carlo approach
+SAMPLINGS = ("uniform", "stratified")
+
+# Randomization test of the current worker, see get_pool()
+WORKER = threading.local()
 
 
 class RandTestResult:
@@ -52,9 +84,24 @@ class RandTestResult:
             Number of permutations.
 
         p_value : int
-            The p value is equal to `num_successes / num_permutations`.
+            The p value is equal to `num_successes / num_permutations`,
+            except for the stratified sampling scheme, where it is the
+            weighted estimate over the numbers of swapped units.
 
         seed : int, None,
+
+        p_value_approx : float, None
+            Tail approximation of the p value (None if not requested).
+
+        p_value_approx_se : float, None
+            Standard error of `p_value_approx`.
+
+        p_value_se : float, None
+            Standard error of the p value estimate of the stratified
+            sampling scheme (None otherwise).
+
+        plan : RandTestPlan, None
+            Plan of the randomization test (None if not planned).
     """
 
     def __init__(
@@ -67,6 +114,11 @@ class RandTestResult:
         num_successes=0,
         num_permutations=0,
         seed=None,
+        p_value_approx=None,
+        p_value_approx_se=None,
+        plan=None,
+        p_value=None,
+        p_value_se=None,
     ):
         self._method = method
         self._alternative = alternative
@@ -76,6 +128,11 @@ class RandTestResult:
         self._nhits = num_successes
         self._nperms = num_permutations
         self._seed = seed
+        self._p_approx = p_value_approx
+        self._p_approx_se = p_value_approx_se
+        self._plan = plan
+        self._p_value = p_value
+        self._p_value_se = p_value_se
 
     @property
     def method(self) -> str:
@@ -115,13 +172,35 @@ class RandTestResult:
     @property
     def p_value(self) -> float:
         """Getter: p_value"""
+        if self._p_value is not None:
+            return self._p_value
         return self.num_successes / self.num_permutations
 
+    @property
+    def p_value_se(self) -> float:
+        """Getter: p_value_se"""
+        return self._p_value_se
+
     @property
     def seed(self) -> float:
         """Getter: seed"""
         return self._seed
 
+    @property
+    def p_value_approx(self) -> float:
+        """Getter: p_value_approx"""
+        return self._p_approx
+
+    @property
+    def p_value_approx_se(self) -> float:
+        """Getter: p_value_approx_se"""
+        return self._p_approx_se
+
+    @property
+    def plan(self):
+        """Getter: plan"""
+        return self._plan
+
     def __repr__(self):
         repr_string = "{}".format(self.__class__)
         return repr_string
@@ -150,6 +229,15 @@ class RandTestResult:
             self.p_value,
             self.seed,
         )
+        if self.p_value_se is not None:
+            print_string += "\np value standard error = {:g}".format(
+                self.p_value_se
+            )
+        if self.p_value_approx is not None:
+            print_string += "\np value (tail approximation) = {:g}".format(
+                self.p_value_approx
+            )
+            print_string += " +/- {:g}".format(self.p_value_approx_se)
         return print_string
 
 
@@ -158,6 +246,45 @@ class RandTest:
     RandTest Class
 
     Carries out the computation of a randomization test.
+
+    If the group sizes are equal and the test statistic is antisymmetric
+    (declared by `tstat.antisymmetric = True`), the complement of each data
+    permutation yields the negated test statistic value. The systematic
+    approach then only evaluates the data permutations that assign the
+    first unit to group A and counts each of them together with its
+    complement.
+
+    If the pooled data have few distinct values (e.g., binary, ordinal, or
+    count outcomes), most data permutations of the systematic approach
+    yield the same groups of values. The systematic approach then enumerates
+    the distinct compositions of group A instead, i.e., how many units of
+    each distinct value are assigned to group A, and weights each
+    composition (a_1, ..., a_k) by its number of data permutations
+    C(c_1, a_1) * ... * C(c_k, a_k), where c_j is the number of units with
+    the j-th distinct value (multivariate hypergeometric count). The test
+    statistic is evaluated on the values in ascending order, so it must not
+    depend on the order of the data within a group.
+
+    If strata are given, the data are permuted within each stratum only.
+    For the difference between arithmetic means, the systematic approach
+    then enumerates the product of the per-stratum combinations as a mixed
+    radix counter over precomputed per-stratum partial sums, such that each
+    data permutation is assembled from the partial sums of the strata.
+
+    With `sampling='stratified'`, the Monte Carlo approach stratifies the
+    random data permutations by the number m of units that swap groups,
+    i.e., m units of group A move to group B and m units of group B move to
+    group A. Under uniform sampling, m follows the hypergeometric
+    distribution w_m = C(n_x, m) * C(n_y, m) / C(n, n_x). The stratified
+    scheme allocates the permutations to the strata in proportion to w_m,
+    draws uniformly within each stratum, and estimates the p value by
+    sum_m(w_m * p_m), where p_m is the fraction of successes in stratum m.
+    Each p_m is an unbiased estimate of the p value within stratum m, so the
+    estimate is unbiased for the p value of the systematic approach, while
+    its variance does not exceed the one of uniform sampling (proportional
+    allocation removes the variance between the strata). Strata with no
+    more data permutations than allocated draws (e.g., m = 0, which only
+    contains the observed data permutation) are enumerated exactly.
     """
 
     def __init__(
@@ -170,74 +297,463 @@ class RandTest:
         alternative,
         n_jobs,
         seed,
+        strata=None,
+        tail_size=0,
+        backend="processes",
+        block_size=BLOCK_SIZE,
+        sampling="uniform",
     ):
         self.mct = mct
         self.tstat = tstat
         self.method = "Monte Carlo" if num_permutations > 1 else "Systematic"
         self.alternative = alternative
         self.njobs = n_jobs
+        self.backend = backend
+        self.block_size = block_size
         self.rng = check_random_state(seed)
 
         self.tobs = self.tstat(data_group_a, data_group_b, self.mct)
         self.data = data_group_a + data_group_b
         self.n_x = len(data_group_a)
         self.n_data = len(self.data)
+        self.strata = None if strata is None else self._get_strata(strata)
+
+        self.sum_based = is_mean(mct) and is_difference(tstat)
+        self.sum_data = sum_data(self.data)
+        self.tol = 0.0
+        if self.sum_based:
+            self.tol = sum_tolerance(self.data)
+
+        # Few distinct values: enumerate the compositions of group A
+        self.multiset = None
+        if self.method == "Systematic" and self.strata is None:
+            self.multiset = self._get_multiset(data_group_a)
+        # Equal group sizes and an antisymmetric test statistic: the
+        # complement of a data permutation yields the negated value
+        self.symmetric = (
+            self.method == "Systematic"
+            and self.strata is None
+            and self.multiset is None
+            and 2 * self.n_x == self.n_data
+            and has_capability(tstat, ANTISYMMETRIC)
+        )
 
+        self.tail_size = tail_size
+        self.tail = []
         self.num_successes = 0
         self.num_permutations = num_permutations
 
+        self.sampling = sampling
+        # Stratified sampling: (number of successes, number of
+        # permutations) per number of swapped units
+        self.swaps = {}
+
     def compute_test_statistic(self, idx_group_a) -> bool:
         """Function to the multiprocessing computation of the test statistic"""
-        idx_group_b = (i for i in range(self.n_data) if i not in idx_group_a)
-        tval = self.tstat(
-            (self.data[i] for i in idx_group_a),
-            (self.data[j] for j in idx_group_b),
-            self.mct,
-        )
-        if self.alternative == "two_sided":
-            hit = abs(tval) >= abs(self.tobs)
-        elif self.alternative == "greater":
-            hit = tval >= self.tobs
+        tval = self._statistic(idx_group_a)
+        return is_success(tval, self.tobs, self.alternative, self.tol)
+
+    def compute_block(self, block) -> tuple:
+        """
+        Function to the multiprocessing computation of a block of data
+        permutations. A block is either a tuple of group A indices or a range
+        of positions in the product of the per-stratum combinations.
+        Returns the number of successes, the number of permutations, and
+        the largest test statistic values (oriented according to the
+        `alternative`) if the tail approximation is requested.
+        """
+        if isinstance(block, range):
+            tvals = map(self._mean_difference, self._stratified_sums(block))
         else:
-            hit = tval <= self.tobs
-        return hit
+            tvals = map(self._statistic, block)
+        num_permutations = len(block)
+        if self.symmetric:
+            # Count each representative together with its complement
+            tvals = (sign * tval for tval in tvals for sign in (1, -1))
+            num_permutations *= 2
+        num_successes, tail = 0, []
+        for tval in tvals:
+            num_successes += is_success(
+                tval, self.tobs, self.alternative, self.tol
+            )
+            if self.tail_size > 0:
+                oriented = orient(tval, self.alternative)
+                if len(tail) < self.tail_size:
+                    heapq.heappush(tail, oriented)
+                elif oriented > tail[0]:
+                    heapq.heapreplace(tail, oriented)
+        return num_successes, num_permutations, tail
+
+    def compute_multiset_block(self, block) -> tuple:
+        """
+        Function to the multiprocessing computation of a block of
+        compositions of group A. Returns the number of successes and the
+        number of permutations, both weighted by the number of data
+        permutations of each composition.
+        """
+        values, counts, tobs = self.multiset
+        binomials = [binomial_table(count) for count in counts]
+        num_successes, num_permutations = 0, 0
+        for composition in block:
+            weight = 1
+            for table, num_a in zip(binomials, composition):
+                weight *= table[num_a]
+            tval = self._multiset_statistic(composition, values, counts)
+            if is_success(tval, tobs, self.alternative, self.tol):
+                num_successes += weight
+            num_permutations += weight
+        return num_successes, num_permutations, []
+
+    def compute_swap_block(self, task) -> tuple:
+        """
+        Function to the multiprocessing computation of a block of data
+        permutations with the same number of swapped units. Returns the
+        number of swapped units, the number of successes, and the number of
+        permutations.
+        """
+        num_swaps, block = task
+        num_successes, num_permutations, _ = self.compute_block(block)
+        return num_swaps, num_successes, num_permutations
 
     def run(self):
         """Run the multiprocessing computation of randomization test."""
+        if self.method == "Monte Carlo" and self.sampling == "stratified":
+            self._run_stratified()
+            return
         if self.method == "Systematic":
             self.num_permutations = 0
-            with mp.Pool(self.njobs) as pool:
-                for is_success in pool.imap_unordered(
-                    self.compute_test_statistic,
-                    combinations(range(self.n_data), self.n_x),
-                ):
-                    self.num_permutations += 1
-                    self.num_successes += int(is_success)
-                    self._log_progress()
+            blocks = self._get_systematic_blocks()
         else:
             # Valid Monte Carlo Randomization Test includes observed tobs
             self.num_successes += 1
-            with mp.Pool(self.njobs) as pool:
-                for is_success in pool.imap_unordered(
-                    self.compute_test_statistic, self._get_random_indices()
-                ):
-                    self.num_successes += int(is_success)
-                    self._log_progress()
-
-    def _log_progress(self):
-        """Log Progress"""
-        logging.info(
-            "p value = %d / %d = %g",
-            self.num_successes,
-            self.num_permutations,
-            self.num_successes / self.num_permutations,
+            blocks = iter_blocks(self._get_random_indices(), self.block_size)
+        func = worker_method("compute_block")
+        if self.multiset is not None:
+            func = worker_method("compute_multiset_block")
+        with get_pool(self.backend, self.njobs, self) as pool:
+            for num_successes, num_permutations, tail in imap_bounded(
+                pool, func, blocks, INFLIGHT_PER_JOB * self.njobs
+            ):
+                self.num_successes += num_successes
+                if self.method == "Systematic":
+                    self.num_permutations += num_permutations
+                if tail:
+                    self.tail = heapq.nlargest(
+                        self.tail_size, self.tail + tail
+                    )
+                log_progress(self.num_successes, self.num_permutations)
+
+    def p_value_estimate(self) -> tuple:
+        """
+        Stratified sampling: estimate of the p value and its standard error,
+        i.e., sum_m(w_m * p_m) and sqrt(sum_m(w_m^2 * p_m * (1 - p_m) / N_m))
+        over the sampled strata with N_m data permutations
+        """
+        num_total = self.count_permutations()
+        p_value, variance = 0.0, 0.0
+        for num_swaps, (num_successes, num_perms) in self.swaps.items():
+            size = n_choose_k(self.n_x, num_swaps) * n_choose_k(
+                self.n_data - self.n_x, num_swaps
+            )
+            weight = size / num_total
+            p_swaps = num_successes / num_perms
+            p_value += weight * p_swaps
+            if num_perms < size:
+                variance += weight ** 2 * p_swaps * (1 - p_swaps) / num_perms
+        return p_value, math.sqrt(variance)
+
+    def count_permutations(self) -> int:
+        """Number of data permutations of the systematic approach"""
+        if self.strata is None:
+            return n_choose_k(self.n_data, self.n_x)
+        num_total = 1
+        for idx, n_x in self.strata:
+            num_total *= n_choose_k(len(idx), n_x)
+        return num_total
+
+    def count_evaluations(self) -> int:
+        """
+        Number of test statistic evaluations of the systematic approach,
+        i.e., the number of data permutations, the number of compositions
+        of group A if the data have few distinct values, or half the number
+        of data permutations for symmetric designs
+        """
+        if self.strata is not None:
+            return self.count_permutations()
+        num_evaluations = self._count_index_evaluations()
+        values, counts = self._count_values()
+        num_compositions = count_compositions(counts, self.n_x)
+        if is_multiset_faster(num_compositions, len(values), num_evaluations):
+            return num_compositions
+        return num_evaluations
+
+    def evaluate_random(self, size):
+        """
+        Generate and evaluate `size` random data permutations in the calling
+        process (calibration run of the planner).
+        """
+        self.num_permutations = size + 1
+        return self.compute_block(tuple(self._get_random_indices()))
+
+    def _statistic(self, idx_group_a) -> float:
+        """Test statistic value of a data permutation"""
+        if self.sum_based:
+            sum_a = sum(self.data[i] for i in idx_group_a)
+            return self._mean_difference(sum_a)
+        idx_group_b = (i for i in range(self.n_data) if i not in idx_group_a)
+        return self.tstat(
+            (self.data[i] for i in idx_group_a),
+            (self.data[j] for j in idx_group_b),
+            self.mct,
+        )
+
+    def _get_systematic_blocks(self):
+        """Split all data permutations into blocks"""
+        if self.multiset is not None:
+            return iter_blocks(self._compositions(), self.block_size)
+        if self.symmetric:
+            # One representative per complement pair: the combinations of
+            # group A containing the first unit
+            return iter_blocks(
+                (
+                    (0,) + combo
+                    for combo in combinations(
+                        range(1, self.n_data), self.n_x - 1
+                    )
+                ),
+                self.block_size,
+            )
+        if self.strata is None:
+            return iter_blocks(
+                combinations(range(self.n_data), self.n_x), self.block_size
+            )
+        if self.sum_based:
+            num_total = self.count_permutations()
+            block_size = max(
+                self.block_size,
+                4 * sum(n_choose_k(len(i), k) for i, k in self.strata),
+            )
+            return (
+                range(start, min(start + block_size, num_total))
+                for start in range(0, num_total, block_size)
+            )
+        return iter_blocks(
+            (
+                tuple(i for combo in combos for i in combo)
+                for combos in product(
+                    *(combinations(i, k) for i, k in self.strata)
+                )
+            ),
+            self.block_size,
+        )
+
+    def _count_values(self):
+        """Distinct values of the pooled data and their counts"""
+        counts = {}
+        for x in self.data:
+            counts[x] = counts.get(x, 0) + 1
+        values = tuple(sorted(counts))
+        return values, tuple(counts[x] for x in values)
+
+    def _count_index_evaluations(self) -> int:
+        """
+        Number of test statistic evaluations of the systematic approach on
+        data permutations, i.e., half of them for symmetric designs
+        """
+        num_total = self.count_permutations()
+        if 2 * self.n_x == self.n_data and has_capability(
+            self.tstat, ANTISYMMETRIC
+        ):
+            return num_total // 2
+        return num_total
+
+    def _get_multiset(self, data_group_a):
+        """
+        Return (distinct values, counts, test statistic value of the
+        observed composition) if enumerating the compositions of group A is
+        clearly faster than enumerating data permutations, None otherwise.
+        """
+        values, counts = self._count_values()
+        if len(values) == self.n_data:
+            return None
+        num_compositions = count_compositions(counts, self.n_x)
+        if not is_multiset_faster(
+            num_compositions, len(values), self._count_index_evaluations()
+        ):
+            return None
+        composition = tuple(data_group_a.count(x) for x in values)
+        # Evaluate the observed test statistic value on the values in the
+        # same order as all other compositions
+        tobs = self._multiset_statistic(composition, values, counts)
+        return values, counts, tobs
+
+    def _multiset_statistic(self, composition, values, counts) -> float:
+        """Test statistic value of a composition of group A"""
+        if self.sum_based:
+            return self._mean_difference(
+                sum(num_a * x for num_a, x in zip(composition, values))
+            )
+        return self.tstat(
+            (x for num_a, x in zip(composition, values) for _ in range(num_a)),
+            (
+                x
+                for num_a, num, x in zip(composition, counts, values)
+                for _ in range(num - num_a)
+            ),
+            self.mct,
+        )
+
+    def _compositions(self):
+        """
+        Generate all compositions of group A, i.e., the numbers of units of
+        each distinct value assigned to group A, in lexicographic order
+        """
+        counts = self.multiset[1]
+        capacities = [0] * (len(counts) + 1)
+        for j in reversed(range(len(counts))):
+            capacities[j] = capacities[j + 1] + counts[j]
+
+        def extend(j, remaining, prefix):
+            if j == len(counts):
+                yield prefix
+                return
+            lowest = max(0, remaining - capacities[j + 1])
+            highest = min(counts[j], remaining)
+            for num_a in range(lowest, highest + 1):
+                yield from extend(j + 1, remaining - num_a, prefix + (num_a,))
+
+        return extend(0, self.n_x, ())
+
+    def _mean_difference(self, sum_a):
+        """Difference between arithmetic means given the sum of group A"""
+        return sum_a / self.n_x - (self.sum_data - sum_a) / (
+            self.n_data - self.n_x
+        )
+
+    def _stratified_sums(self, positions):
+        """
+        Yield the sums of group A for the given range of positions in the
+        product of the per-stratum combinations (last stratum varies
+        fastest). Each sum adds the partial sum of the last stratum to the
+        sum of the other strata, which is rebuilt from their partial sums
+        whenever their combinations change, such that rounding errors do
+        not accumulate along the block.
+        """
+        partial_sums = [
+            [sum(self.data[i] for i in c) for c in combinations(idx, k)]
+            for idx, k in self.strata
+        ]
+        digits, rest = [], positions.start
+        for sums in reversed(partial_sums):
+            rest, digit = divmod(rest, len(sums))
+            digits.insert(0, digit)
+        last_sums = partial_sums[-1]
+        sum_others = sum(
+            sums[d] for sums, d in zip(partial_sums[:-1], digits[:-1])
+        )
+        for _ in positions:
+            yield sum_others + last_sums[digits[-1]]
+            for s in reversed(range(len(digits))):
+                digits[s] = (digits[s] + 1) % len(partial_sums[s])
+                if digits[s] > 0:
+                    break
+            if s < len(digits) - 1:
+                sum_others = sum(
+                    sums[d] for sums, d in zip(partial_sums[:-1], digits[:-1])
+                )
+
+    def _get_strata(self, strata):
+        """
+        Turn the strata labels of group A and group B into a list of
+        (indices of the pooled data, number of group A units) per stratum.
+        """
+        labels_a, labels_b = (tuple(labels) for labels in strata)
+        assert len(labels_a) == self.n_x
+        assert len(labels_b) == self.n_data - self.n_x
+        indices = {}
+        for i, label in enumerate(labels_a + labels_b):
+            indices.setdefault(label, []).append(i)
+        return [
+            (tuple(idx), sum(1 for i in idx if i < self.n_x))
+            for idx in indices.values()
+        ]
+
+    def _run_stratified(self):
+        """Run the stratified sampling scheme, see the class docstring."""
+        # Valid Monte Carlo Randomization Test includes observed tobs,
+        # i.e., the only data permutation without swapped units
+        num_draws = self.num_permutations - 1
+        self.swaps = {0: (1, 1)}
+        self.num_successes, self.num_permutations = 1, 1
+        blocks = (
+            (num_swaps, block)
+            for num_swaps, indices in self._get_swap_indices(num_draws)
+            for block in iter_blocks(indices, self.block_size)
+        )
+        with get_pool(self.backend, self.njobs, self) as pool:
+            for num_swaps, num_successes, num_permutations in imap_bounded(
+                pool,
+                worker_method("compute_swap_block"),
+                blocks,
+                INFLIGHT_PER_JOB * self.njobs,
+            ):
+                hits, perms = self.swaps.get(num_swaps, (0, 0))
+                self.swaps[num_swaps] = (
+                    hits + num_successes,
+                    perms + num_permutations,
+                )
+                self.num_successes += num_successes
+                self.num_permutations += num_permutations
+                log_progress(self.num_successes, self.num_permutations)
+
+    def _get_swap_indices(self, num_draws):
+        """
+        Yield (number of swapped units m, data permutations) per stratum of
+        the stratified sampling scheme. Each stratum with m > 0 receives
+        its share w_m of the `num_draws` random data permutations (at least
+        one); if that is
+        not less than its number of data permutations, the stratum is
+        enumerated instead.
+        """
+        n_y = self.n_data - self.n_x
+        num_total = self.count_permutations()
+        group_a = range(self.n_x)
+        group_b = range(self.n_x, self.n_data)
+        for num_swaps in range(1, min(self.n_x, n_y) + 1):
+            size = n_choose_k(self.n_x, num_swaps) * n_choose_k(n_y, num_swaps)
+            num_stratum = max(1, round(num_draws * size / num_total))
+            if num_stratum >= size:
+                indices = (
+                    tuple(i for i in group_a if i not in moved) + joined
+                    for moved in combinations(group_a, num_swaps)
+                    for joined in combinations(group_b, num_swaps)
+                )
+            else:
+                indices = (
+                    self._swap(group_a, group_b, num_swaps)
+                    for _ in range(num_stratum)
+                )
+            yield num_swaps, indices
+
+    def _swap(self, group_a, group_b, num_swaps) -> tuple:
+        """Random data permutation with `num_swaps` swapped units"""
+        moved = set(self.rng.sample(group_a, num_swaps))
+        return tuple(i for i in group_a if i not in moved) + tuple(
+            self.rng.sample(group_b, num_swaps)
         )
 
     def _get_random_indices(self):
         # Valid Monte Carlo Randomization Test includes observed tobs
         # Generate one random permutation less
         for _ in range(self.num_permutations - 1):
-            yield self.rng.sample(range(self.n_data), self.n_x)
+            if self.strata is None:
+                yield self.rng.sample(range(self.n_data), self.n_x)
+            else:
+                yield tuple(
+                    i
+                    for idx, n_x in self.strata
+                    for i in self.rng.sample(idx, n_x)
+                )
 
 
 def test_statistic(
@@ -247,6 +763,191 @@ def test_statistic(
     return mct(data_group_a) - mct(data_group_b)
 
 
+# Swapping the groups negates the test statistic value
+test_statistic.antisymmetric = True
+register_statistic("difference", test_statistic, (ANTISYMMETRIC,))
+
+
+def is_exact(data) -> bool:
+    """Check whether the data are ints, such that their sums are exact"""
+    return all(isinstance(x, int) for x in data)
+
+
+def sum_data(data):
+    """Sum of the data: exact for ints, correctly rounded for floats"""
+    return sum(data) if is_exact(data) else math.fsum(data)
+
+
+def center_shift(data):
+    """
+    Shift that centers the data, i.e., their mean (rounded for ints, such
+    that the shifted data stay ints and their sums exact)
+    """
+    shift = sum_data(data) / len(data)
+    return round(shift) if is_exact(data) else shift
+
+
+def sum_tolerance(data) -> float:
+    """
+    Tolerance absorbing the rounding errors of the difference between
+    arithmetic means computed from sums of the data, see
+    rounding_tolerance().
+    """
+    if not data:
+        return 0.0
+    return rounding_tolerance(
+        max(abs(x) for x in data), len(data), is_exact(data)
+    )
+
+
+def rounding_tolerance(max_abs, num_values, exact=False) -> float:
+    """
+    Rounding error of a mean (difference) computed from sums of
+    `num_values` values of magnitude at most `max_abs`: for floats, it is
+    off by about num_values * eps * max_abs, while sums of ints are exact,
+    such that only the divisions and the difference round (a few ulps).
+    """
+    eps = sys.float_info.epsilon
+    if exact:
+        return 4 * eps * max_abs
+    return max(4, num_values) * eps * max_abs
+
+
+def is_multiset_faster(num_compositions, num_values, num_evaluations):
+    """
+    Check whether enumerating `num_compositions` compositions of `num_values`
+    distinct values is clearly faster than `num_evaluations` test statistic
+    evaluations on data permutations. The weight and the test statistic of
+    a composition cost O(`num_values`) each, so count each composition
+    `num_values` times.
+    """
+    return num_compositions * num_values < num_evaluations
+
+
+def is_success(tval, tobs, alternative, tol=0.0) -> bool:
+    """
+    Check whether a test statistic value counts as a success w.r.t. the
+    observed test statistic value according to the `alternative`.
+    A positive `tol` absorbs rounding errors of incrementally updated sums.
+    """
+    if alternative == "two_sided":
+        hit = abs(tval) >= abs(tobs) - tol
+    elif alternative == "greater":
+        hit = tval >= tobs - tol
+    else:
+        hit = tval <= tobs + tol
+    return hit
+
+
+def is_mean(mct) -> bool:
+    """Check whether `mct` is the arithmetic mean (enables sum-based paths)"""
+    return mct in (mean, arithmetic_mean) or has_capability(mct, SUM_BASED)
+
+
+def is_difference(tstat) -> bool:
+    """Check whether `tstat` is the difference between the MCTs"""
+    if isinstance(tstat, StatisticSpec):
+        tstat = tstat.function
+    return tstat is test_statistic
+
+
+def iter_blocks(iterable, block_size):
+    """Lazily split an iterable into tuples of (at most) `block_size` items"""
+    iterator = iter(iterable)
+    while True:
+        block = tuple(islice(iterator, block_size))
+        if not block:
+            break
+        yield block
+
+
+def n_choose_k(n, k) -> int:
+    """Binomial coefficient: number of combinations of k out of n items"""
+    if not 0 <= k <= n:
+        return 0
+    return math.factorial(n) // (math.factorial(k) * math.factorial(n - k))
+
+
+def binomial_table(n) -> list:
+    """Binomial coefficients C(n, k) for k = 0, ..., n"""
+    table = [1]
+    for k in range(n):
+        table.append(table[-1] * (n - k) // (k + 1))
+    return table
+
+
+def count_compositions(counts, total) -> int:
+    """
+    Number of vectors (a_1, ..., a_k) with 0 <= a_j <= counts[j] and
+    a_1 + ... + a_k = total
+    """
+    ways = [1] + [0] * total
+    for count in counts:
+        # Sliding window sum over ways[s - count], ..., ways[s]
+        updated, window = [], 0
+        for num, value in enumerate(ways):
+            window += value
+            if num > count:
+                window -= ways[num - count - 1]
+            updated.append(window)
+        ways = updated
+    return ways[total]
+
+
+def imap_bounded(pool, func, tasks, max_inflight):
+    """
+    Apply `func` to each task on the pool and yield the results as they
+    come in (in arbitrary order), like `pool.imap_unordered`. In contrast
+    to the latter, which consumes the task iterable eagerly in a background
+    thread, at most `max_inflight` tasks are outstanding at any time: the
+    next task is only drawn from the iterable after a result came back.
+    The memory of the parent process therefore stays flat irrespective of
+    the total number of tasks.
+    """
+    results = queue.Queue()
+
+    def submit(task):
+        pool.apply_async(
+            func,
+            (task,),
+            callback=lambda value: results.put((True, value)),
+            error_callback=lambda error: results.put((False, error)),
+        )
+
+    tasks = iter(tasks)
+    num_inflight = 0
+    try:
+        for task in islice(tasks, max_inflight):
+            submit(task)
+            num_inflight += 1
+        while num_inflight > 0:
+            is_ok, value = results.get()
+            num_inflight -= 1
+            if not is_ok:
+                raise value
+            for task in islice(tasks, 1):
+                submit(task)
+                num_inflight += 1
+            yield value
+    finally:
+        # On an error or an early exit, wait for the outstanding tasks:
+        # terminating a process pool while its task handler still feeds
+        # the workers may deadlock
+        while num_inflight > 0:
+            results.get()
+            num_inflight -= 1
+
+
+def log_progress(num_successes, num_permutations):
+    """Log Progress"""
+    logging.info(
+        "p value = %d / %d = %g",
+        num_successes,
+        num_permutations,
+        num_successes / num_permutations,
+    )
+
+
 def check_random_state(seed):
     """
     Turn seed into a random.Random instance
@@ -269,6 +970,199 @@ def check_random_state(seed):
     return rng
 
 
+def set_log_level(log_level):
+    """Configure logging according to `log_level`"""
+    log_levels = {
+        "debug": logging.DEBUG,
+        "info": logging.INFO,
+        "warn": logging.WARNING,
+        "error": logging.ERROR,
+        "critical": logging.CRITICAL,
+    }
+    logging.basicConfig(
+        level=log_levels.get(log_level, logging.WARNING),
+        format=(
+            "%(levelname)s :: "
+            + "%(name)s :: "
+            + "pid = %(process)d :: "
+            + "%(asctime)s :: "
+            + "%(message)s"
+        ),
+        #  datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+
+def get_pool(backend, n_jobs, rtest=None):
+    """
+    Create the worker pool of the `backend`: a process pool ('processes')
+    or a thread pool ('threads') with `n_jobs` workers.
+    The randomization test object `rtest` is shipped to each worker once
+    when the worker starts, such that the tasks only carry their blocks,
+    see worker_method().
+    """
+    pool_class = ThreadPool if backend == "threads" else mp.Pool
+    return pool_class(n_jobs, initializer=set_worker, initargs=(rtest,))
+
+
+def set_worker(rtest):
+    """Worker initializer: keep the randomization test of the worker"""
+    WORKER.rtest = rtest
+
+
+def call_worker(name, task):
+    """Call the method `name` of the worker's randomization test on `task`"""
+    return getattr(WORKER.rtest, name)(task)
+
+
+def worker_method(name):
+    """
+    Task function calling the method `name` of the randomization test that
+    was shipped to the worker by get_pool(). In contrast to a bound method,
+    it pickles to a few bytes.
+    """
+    return functools.partial(call_worker, name)
+
+
+def get_num_jobs(num_jobs) -> int:
+    """
+    Turn `num_jobs` into the number of worker processes.
+    Negative values count backwards from the number of cores,
+    i.e., `num_jobs=-1` uses all cores.
+    """
+    max_cores = mp.cpu_count()
+    if num_jobs > 0:
+        n_jobs = num_jobs
+        if num_jobs > max_cores:
+            logging.warning(
+                "Specified number of jobs (%d) is larger than the "
+                + "maximum number of cores (%d). "
+                + "Setting number of jobs to %d.",
+                num_jobs,
+                max_cores,
+                max_cores,
+            )
+            n_jobs = max_cores
+    else:
+        n_jobs = max_cores + num_jobs + 1
+        if n_jobs <= 0:
+            logging.warning(
+                "Specified number of jobs (%d) goes beyond "
+                + "the maximum number of cores (%d). "
+                + "Setting number of jobs to %d.",
+                num_jobs,
+                max_cores,
+                max_cores,
+            )
+            n_jobs = max_cores
+    return n_jobs
+
+
+def check_arguments(
+    num_jobs, log_level, backend, num_permutations=None, alternative=None
+):
+    """
+    Check the arguments shared by the entry points: the number of jobs, the
+    log level, the backend, and, unless None, the number of permutations
+    (-1 for the systematic approach) and the alternative.
+    """
+    assert isinstance(num_jobs, int) and num_jobs != 0
+    assert isinstance(log_level, str) and log_level in [
+        "debug",
+        "info",
+        "warn",
+        "error",
+        "critical",
+    ]
+    assert isinstance(backend, str) and backend in BACKENDS
+    if num_permutations is not None:
+        assert isinstance(num_permutations, int) and num_permutations != 0
+        if num_permutations < 0:
+            assert num_permutations == -1
+    if alternative is not None:
+        assert isinstance(alternative, str) and alternative in [
+            "two_sided",
+            "greater",
+            "less",
+        ]
+
+
+def get_plan(
+    data_group_a,
+    data_group_b,
+    mct,
+    tstat,
+    num_permutations,
+    max_seconds,
+    n_jobs,
+    strata=None,
+):
+    """Plan a randomization test, see randtest.planner"""
+    # Calibrate with a separate random number generator, such that planning
+    # does not affect the data permutations of a seeded randomization test
+    rtest = RandTest(
+        data_group_a,
+        data_group_b,
+        mct,
+        tstat,
+        2,
+        "two_sided",
+        1,
+        0,
+        strata,
+    )
+    return plan(
+        rtest.evaluate_random,
+        rtest.count_permutations(),
+        num_permutations,
+        max_seconds,
+        n_jobs,
+        rtest.count_evaluations(),
+    )
+
+
+def plan_randtest(
+    data_group_a,
+    data_group_b,
+    mct=mean,
+    tstat=test_statistic,
+    num_permutations=10000,
+    num_jobs=1,
+    strata=None,
+    max_seconds=None,
+):
+    """
+    Plan a randomization test without carrying it out (dry run).
+    See randtest() for the parameters.
+
+    Returns
+    -------
+    RandTestPlan object, see randtest.planner.RandTestPlan.
+    If `max_seconds` is None, the plan estimates the duration of the
+    randomization test with `num_permutations`.
+    """
+    if not isinstance(data_group_a, tuple):
+        data_group_a = tuple(data_group_a)
+    if not isinstance(data_group_b, tuple):
+        data_group_b = tuple(data_group_b)
+    mct, tstat = get_statistic(mct), get_statistic(tstat)
+    assert isinstance(num_permutations, int) and num_permutations != 0
+    if num_permutations < 0:
+        assert num_permutations == -1
+    assert isinstance(num_jobs, int) and num_jobs != 0
+    if max_seconds is not None:
+        assert isinstance(max_seconds, (int, float)) and max_seconds > 0
+    return get_plan(
+        data_group_a,
+        data_group_b,
+        mct,
+        tstat,
+        num_permutations,
+        max_seconds,
+        get_num_jobs(num_jobs),
+        strata,
+    )
+
+
 def randtest(
     data_group_a,
     data_group_b,
@@ -279,6 +1173,11 @@ def randtest(
     num_jobs=1,
     log_level="warn",
     seed=None,
+    strata=None,
+    tail_approximation=False,
+    backend="processes",
+    max_seconds=None,
+    sampling="uniform",
 ):
     """
     Perform a randomization test with custom test statistic.
@@ -289,13 +1188,26 @@ def randtest(
     data_group_b : tuple
         Data of group B.
 
-    mct : function
+    mct : function, StatisticSpec, str
         Measure of central tendency to be computed in the test statistic.
+        Either a function, a specification of a registered statistic, e.g.,
+        `StatisticSpec("trimmed_mean", trim_percent=0.1)`, or the name of a
+        registered statistic, e.g., "median", see randtest.specs.
         Default: mean().
 
-    tstat : function
+    tstat : function, StatisticSpec, str
         Test statistic.
         Default: Difference between the mcts of the two groups.
+        If swapping the groups negates the test statistic value, i.e.,
+        `tstat(B, A, mct) == -tstat(A, B, mct)`, declare it with
+        `tstat.antisymmetric = True` (as for the default): for equal group
+        sizes, the systematic approach then evaluates only one data
+        permutation per pair of complementary data permutations.
+        If the data have few distinct values, the systematic approach may
+        evaluate the compositions of group A instead of the data
+        permutations: the test statistic then sees the values of each group
+        in ascending order, not in the order given, so it must not depend on
+        the order of the values.
 
     num_permutations : int
         Number of permutations to be carried out for the randomization test.
@@ -319,6 +1231,50 @@ def randtest(
 
     seed : None, int, random.Random() instance
 
+    strata : None, tuple of two sequences
+        Stratum labels of the units of group A and of group B, i.e.,
+        `strata=(labels_a, labels_b)` with `len(labels_a) == len(data_group_a)`
+        and `len(labels_b) == len(data_group_b)`. If given, the data are
+        permuted within each stratum only, as required for experiments that
+        are randomized within blocks (e.g., regions or days).
+        Default: None (no stratification).
+
+    tail_approximation : bool
+        If True, approximate small Monte Carlo p values by fitting a
+        generalized Pareto distribution to the largest test statistic values
+        of the data permutations, see randtest.tail. If there are enough
+        permutations with a test statistic value at least as extreme as the
+        observed one, the empirical p value is reported instead.
+        The approximation is reported as `p_value_approx` together with its
+        standard error `p_value_approx_se`.
+
+    backend : str
+        Worker pool to carry out the computation.
+        Possible values: 'processes' (default) and 'threads'.
+
+    max_seconds : None, float
+        Time budget in seconds. If given, the randomization test is planned
+        based on a short calibration run of the test statistic: the
+        systematic approach is chosen if all data permutations can be
+        evaluated within the time budget, otherwise the Monte Carlo approach
+        with as many permutations as fit into the time budget. Furthermore,
+        the number of jobs (at most `num_jobs`) and the number of data
+        permutations per task are chosen. `num_permutations` is ignored.
+        The plan is reported as `plan`, see also plan_randtest().
+        Default: None (no planning).
+
+    sampling : str
+        Sampling scheme of the Monte Carlo approach.
+        Possible values: 'uniform' (default) and 'stratified'.
+        The stratified scheme draws the data permutations per number of
+        units that swap groups in proportion to the share of each number
+        among all data permutations and reports a weighted estimate of the
+        p value (unbiased for the p value of the systematic approach) with
+        its standard error `p_value_se`. For the same number of
+        permutations, its standard error does not exceed the one of uniform
+        sampling. Not available together with `strata` or
+        `tail_approximation`, see RandTest.
+
     Returns
     -------
     RandTestResult object with following attributes
@@ -348,74 +1304,48 @@ def randtest(
             Number of permutations.
 
         p_value : int
-            The p value is equal to `num_successes / num_permutations`.
+            The p value is equal to `num_successes / num_permutations`
+            (weighted estimate for `sampling='stratified'`).
+
+        p_value_se : float, None
+            Standard error of the p value for `sampling='stratified'`.
+
+        plan : RandTestPlan, None
+            Plan of the randomization test if `max_seconds` is given.
     """
     if not isinstance(data_group_a, tuple):
         data_group_a = tuple(data_group_a)
     if not isinstance(data_group_b, tuple):
         data_group_b = tuple(data_group_b)
-    assert isinstance(mct, (FunctionType, functools.partial))
-    assert isinstance(tstat, FunctionType)
-    assert isinstance(num_permutations, int) and num_permutations != 0
-    if num_permutations < 0:
-        assert num_permutations == -1
-    assert isinstance(alternative, str) and alternative in [
-        "two_sided",
-        "greater",
-        "less",
-    ]
-    assert isinstance(num_jobs, int) and num_jobs != 0
-    assert isinstance(log_level, str) and log_level in [
-        "debug",
-        "info",
-        "warn",
-        "error",
-        "critical",
-    ]
-    log_levels = {
-        "debug": logging.DEBUG,
-        "info": logging.INFO,
-        "warn": logging.WARNING,
-        "error": logging.ERROR,
-        "critical": logging.CRITICAL,
-    }
-    logging.basicConfig(
-        level=log_levels.get(log_level, logging.WARNING),
-        format=(
-            "%(levelname)s :: "
-            + "%(name)s :: "
-            + "pid = %(process)d :: "
-            + "%(asctime)s :: "
-            + "%(message)s"
-        ),
-        #  datefmt='%Y-%m-%d %H:%M:%S'
+    mct, tstat = get_statistic(mct), get_statistic(tstat)
+    check_arguments(
+        num_jobs, log_level, backend, num_permutations, alternative
     )
+    assert isinstance(tail_approximation, bool)
+    if max_seconds is not None:
+        assert isinstance(max_seconds, (int, float)) and max_seconds > 0
+    assert isinstance(sampling, str) and sampling in SAMPLINGS
+    if sampling == "stratified":
+        assert strata is None and not tail_approximation
+    set_log_level(log_level)
+    n_jobs = get_num_jobs(num_jobs)
 
-    max_cores = mp.cpu_count()
-    if num_jobs > 0:
-        n_jobs = num_jobs
-        if num_jobs > max_cores:
-            logging.warning(
-                "Specified number of jobs (%d) is larger than the "
-                + "maximum number of cores (%d). "
-                + "Setting number of jobs to %d.",
-                num_jobs,
-                max_cores,
-                max_cores,
-            )
-            n_jobs = max_cores
-    else:
-        n_jobs = max_cores + num_jobs + 1
-        if n_jobs <= 0:
-            logging.warning(
-                "Specified number of jobs (%d) goes beyond "
-                + "the maximum number of cores (%d). "
-                + "Setting number of jobs to %d.",
-                num_jobs,
-                max_cores,
-                max_cores,
-            )
-            n_jobs = max_cores
+    run_plan, block_size = None, BLOCK_SIZE
+    if max_seconds is not None:
+        run_plan = get_plan(
+            data_group_a,
+            data_group_b,
+            mct,
+            tstat,
+            num_permutations,
+            max_seconds,
+            n_jobs,
+            strata,
+        )
+        logging.info("Plan: %s", run_plan)
+        num_permutations = run_plan.num_permutations
+        n_jobs = run_plan.num_jobs
+        block_size = run_plan.block_size
 
     rtest = RandTest(
         data_group_a,
@@ -426,8 +1356,19 @@ def randtest(
         alternative,
         n_jobs,
         seed,
+        strata,
+        min(TAIL_SIZE, num_permutations // 10) if tail_approximation else 0,
+        backend,
+        block_size,
+        sampling,
     )
     rtest.run()
+    p_value_approx, p_value_approx_se = None, None
+    if tail_approximation:
+        p_value_approx, p_value_approx_se = approximate_p_value(rtest)
+    p_value, p_value_se = None, None
+    if rtest.swaps:
+        p_value, p_value_se = rtest.p_value_estimate()
     return RandTestResult(
         rtest.method,
         rtest.alternative,
@@ -437,4 +1378,9 @@ def randtest(
         rtest.num_successes,
         rtest.num_permutations,
         seed,
+        p_value_approx,
+        p_value_approx_se,
+        run_plan,
+        p_value,
+        p_value_se,
     )
@@ -0,0 +1,460 @@
+"""
+Module: ci
+
+Implements:
+ - Confidence interval for an additive shift effect by inverting the
+   randomization test
+
+Under the shift model, the responses of group A are those of group B
+shifted by a constant delta. For a candidate delta, the null hypothesis
+is tested by subtracting delta from the data of group A. The confidence
+interval consists of all delta whose two-sided p value exceeds
+1 - confidence_level.
+
+A single set of data permutations is drawn and reused for all candidate
+values of delta. For the difference between arithmetic means, the test
+statistic of a data permutation P is linear in delta,
+
+    t_P(delta) = a_P + b_P * delta,
+
+where a_P is the test statistic on the unshifted data and b_P only depends
+on how many units of group A are assigned to group A under P. After one
+pass over the data permutations, each p value therefore requires no access
+to the data, and the interval endpoints are found by bisection.
+
+"""
+
+import sys
+import math
+import logging
+from itertools import combinations
+from statistics import mean
+from .base import (
+    BLOCK_SIZE,
+    INFLIGHT_PER_JOB,
+    is_mean,
+    is_success,
+    sum_data,
+    sum_tolerance,
+    center_shift,
+    iter_blocks,
+    imap_bounded,
+    check_random_state,
+    set_log_level,
+    get_pool,
+    get_num_jobs,
+    check_arguments,
+    worker_method,
+)
+from .specs import get_statistic
+
+# Maximum number of bisection (and bracket expansion) steps
+MAX_ITER = 100
+# Resolution of the endpoints relative to the smallest gap between distinct
+# data values if each p value requires a pass over the data
+RESOLUTION = 1e-3
+# Resolution of the endpoints relative to the range of the data otherwise
+SUM_RESOLUTION = 1e-9
+
+
+class RandTestCIResult:
+    """
+    RandTestCIResult class
+
+    Attributes
+    ----------
+        method : str
+            Indicates type of randomization test.
+
+        estimate : float
+            Observed test statistic value, i.e., MCT(A) - MCT(B).
+
+        lower : float
+            Lower endpoint of the confidence interval
+            (-inf if the interval is unbounded).
+
+        upper : float
+            Upper endpoint of the confidence interval
+            (inf if the interval is unbounded).
+
+        confidence_level : float
+            Confidence level of the interval.
+
+        num_permutations : int
+            Number of permutations.
+
+        seed : int, None,
+    """
+
+    def __init__(
+        self,
+        method: str,
+        estimate: float,
+        lower: float,
+        upper: float,
+        confidence_level: float,
+        num_permutations=0,
+        seed=None,
+    ):
+        self._method = method
+        self._estimate = estimate
+        self._lower = lower
+        self._upper = upper
+        self._level = confidence_level
+        self._nperms = num_permutations
+        self._seed = seed
+
+    @property
+    def method(self) -> str:
+        """Getter: method"""
+        return self._method
+
+    @property
+    def estimate(self) -> float:
+        """Getter: estimate"""
+        return self._estimate
+
+    @property
+    def lower(self) -> float:
+        """Getter: lower"""
+        return self._lower
+
+    @property
+    def upper(self) -> float:
+        """Getter: upper"""
+        return self._upper
+
+    @property
+    def confidence_level(self) -> float:
+        """Getter: confidence_level"""
+        return self._level
+
+    @property
+    def num_permutations(self) -> int:
+        """Getter: num_permutations"""
+        return self._nperms
+
+    @property
+    def seed(self) -> float:
+        """Getter: seed"""
+        return self._seed
+
+    def __repr__(self):
+        repr_string = "{}".format(self.__class__)
+        return repr_string
+
+    def __str__(self):
+        print_string = (
+            "{}\n"
+            + "Method = {}\n"
+            + "Estimate = {:g}\n"
+            + "{:g}% confidence interval = [{:g}, {:g}]\n"
+            + "Number of permutations = {:d}\n"
+            "seed = {}"
+        ).format(
+            self.__class__,
+            self.method,
+            self.estimate,
+            100 * self.confidence_level,
+            self.lower,
+            self.upper,
+            self.num_permutations,
+            self.seed,
+        )
+        return print_string
+
+
+class RandTestCI:
+    """
+    RandTestCI Class
+
+    Carries out the computation of a confidence interval by inverting the
+    randomization test with a fixed set of data permutations.
+    """
+
+    def __init__(
+        self,
+        data_group_a,
+        data_group_b,
+        mct,
+        confidence_level,
+        num_permutations,
+        n_jobs,
+        seed,
+        backend="processes",
+    ):
+        self.mct = mct
+        self.method = "Monte Carlo" if num_permutations > 1 else "Systematic"
+        self.alpha = 1 - confidence_level
+        self.njobs = n_jobs
+        self.backend = backend
+        self.rng = check_random_state(seed)
+
+        self.data_group_a = data_group_a
+        self.data_group_b = data_group_b
+        self.data = data_group_a + data_group_b
+        self.n_x = len(data_group_a)
+        self.n_data = len(self.data)
+        self.estimate = mct(data_group_a) - mct(data_group_b)
+
+        self.sum_based = is_mean(mct)
+        if self.sum_based:
+            # The coefficients (a_P, b_P) do not change if all data are
+            # shifted: center the data to keep the sums small
+            shift = center_shift(self.data)
+            self.data = tuple(x - shift for x in self.data)
+        self.sum_data = sum_data(self.data)
+        self.scale = max(self.data) - min(self.data) or 1.0
+        self.tol = sum_tolerance(self.data)
+        # The p values of the sum-based path require no access to the data:
+        # locate the endpoints up to rounding. Otherwise, stop at a fraction
+        # of the resolution at which the data are recorded
+        self.resolution = SUM_RESOLUTION * self.scale
+        if not self.sum_based:
+            values = sorted(set(self.data))
+            gaps = [y - x for x, y in zip(values, values[1:])]
+            self.resolution = RESOLUTION * min(gaps, default=self.scale)
+
+        self.coefficients = []
+        self.indices = []
+        self.lower = -math.inf
+        self.upper = math.inf
+        self.num_permutations = num_permutations
+
+    def compute_coefficients(self, block) -> list:
+        """
+        Function to the multiprocessing computation of the coefficients
+        (a_P, b_P) of the linear test statistic of each data permutation.
+        """
+        n_y = self.n_data - self.n_x
+        coefficients = []
+        for idx_group_a in block:
+            sum_a = sum(self.data[i] for i in idx_group_a)
+            m_a = sum(1 for i in idx_group_a if i < self.n_x)
+            coefficients.append(
+                (
+                    sum_a / self.n_x - (self.sum_data - sum_a) / n_y,
+                    (self.n_x - m_a) / n_y - m_a / self.n_x,
+                )
+            )
+        return coefficients
+
+    def compute_shifted_block(self, args) -> int:
+        """
+        Function to the multiprocessing computation of the number of
+        successes of a block of data permutations for a given shift.
+        """
+        delta, tobs, number = args
+        block = self.indices[number]
+        data = tuple(x - delta for x in self.data_group_a) + self.data_group_b
+        num_successes = 0
+        for idx_group_a in block:
+            chosen = set(idx_group_a)
+            tval = self.mct(data[i] for i in idx_group_a) - self.mct(
+                data[j] for j in range(self.n_data) if j not in chosen
+            )
+            num_successes += is_success(tval, tobs, "two_sided")
+        return num_successes
+
+    def run(self):
+        """
+        Draw the data permutations, precompute their coefficients, and find
+        the endpoints of the confidence interval.
+        """
+        if self.method == "Systematic":
+            indices = combinations(range(self.n_data), self.n_x)
+        else:
+            indices = self._get_random_indices()
+        blocks = iter_blocks(indices, BLOCK_SIZE)
+        if not self.sum_based:
+            # The workers receive the data permutations once with the pool,
+            # such that each task only names a block
+            self.indices = list(blocks)
+        with get_pool(self.backend, self.njobs, self) as pool:
+            if self.sum_based:
+                for coefficients in imap_bounded(
+                    pool,
+                    worker_method("compute_coefficients"),
+                    blocks,
+                    INFLIGHT_PER_JOB * self.njobs,
+                ):
+                    self.coefficients.extend(coefficients)
+                num_draws = len(self.coefficients)
+            else:
+                num_draws = sum(len(block) for block in self.indices)
+            if self.method == "Systematic":
+                self.num_permutations = num_draws
+            else:
+                # Valid Monte Carlo Randomization Test includes observed tobs
+                self.num_permutations = num_draws + 1
+            self.lower = self._endpoint(-1, pool)
+            self.upper = self._endpoint(1, pool)
+
+    def p_value(self, delta, pool) -> float:
+        """Two-sided p value of the null hypothesis of a shift by delta"""
+        if self.sum_based:
+            tobs = self.estimate - delta
+            # Rounding errors of the coefficients and of the shifted values
+            tol = self.tol + 4 * sys.float_info.epsilon * abs(delta)
+            num_successes = sum(
+                is_success(a + b * delta, tobs, "two_sided", tol)
+                for a, b in self.coefficients
+            )
+        else:
+            tobs = self.mct(x - delta for x in self.data_group_a) - self.mct(
+                self.data_group_b
+            )
+            num_successes = sum(
+                imap_bounded(
+                    pool,
+                    worker_method("compute_shifted_block"),
+                    (
+                        (delta, tobs, number)
+                        for number in range(len(self.indices))
+                    ),
+                    INFLIGHT_PER_JOB * self.njobs,
+                )
+            )
+        if self.method == "Monte Carlo":
+            num_successes += 1
+        logging.debug(
+            "delta = %g: p value = %d / %d",
+            delta,
+            num_successes,
+            self.num_permutations,
+        )
+        return num_successes / self.num_permutations
+
+    def _endpoint(self, direction, pool) -> float:
+        """
+        Find the endpoint of the confidence interval below (direction=-1)
+        or above (direction=1) the estimate by bisection.
+        """
+        inside, step = self.estimate, self.scale
+        for _ in range(MAX_ITER):
+            outside = self.estimate + direction * step
+            if self.p_value(outside, pool) <= self.alpha:
+                break
+            inside, step = outside, 2 * step
+        else:
+            return direction * math.inf
+        for _ in range(MAX_ITER):
+            middle = (inside + outside) / 2
+            if middle in (inside, outside):
+                break
+            if self.p_value(middle, pool) > self.alpha:
+                inside = middle
+            else:
+                outside = middle
+            if abs(outside - inside) <= self.resolution:
+                break
+        return inside
+
+    def _get_random_indices(self):
+        # Valid Monte Carlo Randomization Test includes observed tobs
+        # Generate one random permutation less
+        for _ in range(self.num_permutations - 1):
+            yield self.rng.sample(range(self.n_data), self.n_x)
+
+
+def randtest_ci(
+    data_group_a,
+    data_group_b,
+    mct=mean,
+    confidence_level=0.95,
+    num_permutations=10000,
+    num_jobs=1,
+    log_level="warn",
+    seed=None,
+    backend="processes",
+):
+    """
+    Compute a confidence interval for the shift effect by inverting the
+    two-sided randomization test.
+
+    data_group_a : tuple
+        Data of group A.
+
+    data_group_b : tuple
+        Data of group B.
+
+    mct : function, StatisticSpec, str
+        Measure of central tendency to be computed in the test statistic
+        MCT(A) - MCT(B), see randtest.randtest(). For the arithmetic mean
+        (default), each candidate shift is evaluated without recomputing the
+        test statistic on the data. Other measures recompute the test
+        statistic on the same data permutations.
+
+    confidence_level : float
+        Confidence level of the interval (default: 0.95).
+
+    num_permutations : int
+        Number of permutations drawn once and reused for all candidate
+        shifts. If `num_permutations = -1`, all possible data permutations
+        are generated.
+
+    num_jobs : int
+        Number of jobs to carry out the computation.
+
+    log_level : str
+        Set log level.
+        Possible values: 'debug', 'info', 'warn' (default), 'error',
+        and 'critical'.
+
+    seed : None, int, random.Random() instance
+
+    backend : str
+        Worker pool to carry out the computation.
+        Possible values: 'processes' (default) and 'threads'.
+
+    Returns
+    -------
+    RandTestCIResult object with following attributes
+        method : str
+            Indicates type of randomization test.
+
+        estimate : float
+            Observed test statistic value.
+
+        lower : float
+            Lower endpoint of the confidence interval.
+
+        upper : float
+            Upper endpoint of the confidence interval.
+
+        confidence_level : float
+            Confidence level of the interval.
+
+        num_permutations : int
+            Number of permutations.
+    """
+    if not isinstance(data_group_a, tuple):
+        data_group_a = tuple(data_group_a)
+    if not isinstance(data_group_b, tuple):
+        data_group_b = tuple(data_group_b)
+    mct = get_statistic(mct)
+    assert isinstance(confidence_level, float) and 0 < confidence_level < 1
+    check_arguments(num_jobs, log_level, backend, num_permutations)
+    set_log_level(log_level)
+    n_jobs = get_num_jobs(num_jobs)
+
+    rtest = RandTestCI(
+        data_group_a,
+        data_group_b,
+        mct,
+        confidence_level,
+        num_permutations,
+        n_jobs,
+        seed,
+        backend,
+    )
+    rtest.run()
+    return RandTestCIResult(
+        rtest.method,
+        rtest.estimate,
+        rtest.lower,
+        rtest.upper,
+        confidence_level,
+        rtest.num_permutations,
+        seed,
+    )
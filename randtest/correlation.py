@@ -0,0 +1,350 @@
+"""
+Module: correlation
+
+Implements:
+ - Systematic randomization test for association
+ - Monte Carlo randomization test for association
+
+Under the null hypothesis of no association, the responses y are
+exchangeable w.r.t. the values x (e.g., the dose), so each randomization
+permutes the responses. The test statistic is Pearson's correlation
+coefficient r, which is equivalent to the slope of the least squares
+regression line of y on x (both yield the same p value).
+
+The data are centered and normalized once,
+
+    u_i = (x_i - mean(x)) / ||x - mean(x)||,
+    v_i = (y_i - mean(y)) / ||y - mean(y)||,
+
+such that the correlation coefficient of a data permutation P reduces to
+the dot product sum_i(u_i * v_P(i)).
+
+"""
+
+import math
+from operator import mul
+from itertools import permutations
+from .base import (
+    BLOCK_SIZE,
+    INFLIGHT_PER_JOB,
+    is_success,
+    rounding_tolerance,
+    iter_blocks,
+    imap_bounded,
+    log_progress,
+    check_random_state,
+    set_log_level,
+    get_pool,
+    get_num_jobs,
+    check_arguments,
+    worker_method,
+)
+
+
+class RandTestCorrResult:
+    """
+    RandTestCorrResult class
+
+    Attributes
+    ----------
+        method : str
+            Indicates type of randomization test.
+
+        alternative : str
+            Indicates the alternative.
+
+        statistic : float
+            Observed correlation coefficient.
+
+        slope : float
+            Slope of the least squares regression line of y on x.
+
+        num_successes : int
+            Number of successes within generated number of permutations
+            according to the `alternative`.
+
+        num_permutations : int
+            Number of permutations.
+
+        p_value : int
+            The p value is equal to `num_successes / num_permutations`.
+
+        seed : int, None,
+    """
+
+    def __init__(
+        self,
+        method: str,
+        alternative: str,
+        statistic: float,
+        slope: float,
+        num_successes=0,
+        num_permutations=0,
+        seed=None,
+    ):
+        self._method = method
+        self._alternative = alternative
+        self._tobs = statistic
+        self._slope = slope
+        self._nhits = num_successes
+        self._nperms = num_permutations
+        self._seed = seed
+
+    @property
+    def method(self) -> str:
+        """Getter: method"""
+        return self._method
+
+    @property
+    def alternative(self) -> str:
+        """Getter: alternative"""
+        return self._alternative
+
+    @property
+    def statistic(self) -> float:
+        """Getter: statistic"""
+        return self._tobs
+
+    @property
+    def slope(self) -> float:
+        """Getter: slope"""
+        return self._slope
+
+    @property
+    def num_successes(self) -> int:
+        """Getter: num_successes"""
+        return self._nhits
+
+    @property
+    def num_permutations(self) -> int:
+        """Getter: num_permutations"""
+        return self._nperms
+
+    @property
+    def p_value(self) -> float:
+        """Getter: p_value"""
+        return self.num_successes / self.num_permutations
+
+    @property
+    def seed(self) -> float:
+        """Getter: seed"""
+        return self._seed
+
+    def __repr__(self):
+        repr_string = "{}".format(self.__class__)
+        return repr_string
+
+    def __str__(self):
+        print_string = (
+            "{}\n"
+            + "Method = {}\n"
+            + "Alternative = {}\n"
+            + "Observed correlation coefficient = {:g}\n"
+            + "Slope = {:g}\n"
+            + "Number of successes = {:d}\n"
+            + "Number of permutations = {:d}\n"
+            + "p value = {:g}\n"
+            "seed = {}"
+        ).format(
+            self.__class__,
+            self.method,
+            self.alternative,
+            self.statistic,
+            self.slope,
+            self.num_successes,
+            self.num_permutations,
+            self.p_value,
+            self.seed,
+        )
+        return print_string
+
+
+class RandTestCorr:
+    """
+    RandTestCorr Class
+
+    Carries out the computation of a randomization test for association.
+
+    A data permutation is represented by an ordering of the indices of the
+    responses: the i-th value x is paired with the response at the i-th
+    index of the ordering.
+    """
+
+    def __init__(
+        self,
+        data_x,
+        data_y,
+        num_permutations,
+        alternative,
+        n_jobs,
+        seed,
+        backend="processes",
+    ):
+        self.method = "Monte Carlo" if num_permutations > 1 else "Systematic"
+        self.alternative = alternative
+        self.njobs = n_jobs
+        self.backend = backend
+        self.rng = check_random_state(seed)
+
+        self.n_data = len(data_x)
+        self.std_x, norm_x = self._standardize(data_x)
+        self.std_y, norm_y = self._standardize(data_y)
+        self.tobs = self._correlation(range(self.n_data))
+        # Rounding error of a dot product of two unit vectors
+        self.tol = rounding_tolerance(1.0, self.n_data)
+        self.slope = self.tobs * norm_y / norm_x
+
+        self.num_successes = 0
+        self.num_permutations = num_permutations
+
+    def compute_block(self, block) -> tuple:
+        """
+        Function to the multiprocessing computation of the test statistic.
+        Returns the number of successes and the number of permutations of
+        the block.
+        """
+        num_successes = 0
+        for order in block:
+            num_successes += is_success(
+                self._correlation(order), self.tobs, self.alternative, self.tol
+            )
+        return num_successes, len(block)
+
+    def run(self):
+        """Run the multiprocessing computation of randomization test."""
+        if self.method == "Systematic":
+            self.num_permutations = 0
+            orders = permutations(range(self.n_data))
+        else:
+            # Valid Monte Carlo Randomization Test includes observed tobs
+            self.num_successes += 1
+            orders = self._get_random_orders()
+        with get_pool(self.backend, self.njobs, self) as pool:
+            for num_successes, num_permutations in imap_bounded(
+                pool,
+                worker_method("compute_block"),
+                iter_blocks(orders, BLOCK_SIZE),
+                INFLIGHT_PER_JOB * self.njobs,
+            ):
+                self.num_successes += num_successes
+                if self.method == "Systematic":
+                    self.num_permutations += num_permutations
+                log_progress(self.num_successes, self.num_permutations)
+
+    def _correlation(self, order):
+        """Correlation coefficient of a data permutation: dot product"""
+        return sum(map(mul, self.std_x, map(self.std_y.__getitem__, order)))
+
+    def _standardize(self, data):
+        """Center and normalize the data; returns them and their norm"""
+        center = math.fsum(data) / len(data)
+        centered = tuple(x - center for x in data)
+        norm = math.sqrt(math.fsum(x * x for x in centered))
+        assert norm > 0, "### error: data must not be constant."
+        return tuple(x / norm for x in centered), norm
+
+    def _get_random_orders(self):
+        # Valid Monte Carlo Randomization Test includes observed tobs
+        # Generate one random permutation less
+        for _ in range(self.num_permutations - 1):
+            yield self.rng.sample(range(self.n_data), self.n_data)
+
+
+def randtest_corr(
+    data_x,
+    data_y,
+    num_permutations=10000,
+    alternative="two_sided",
+    num_jobs=1,
+    log_level="warn",
+    seed=None,
+    backend="processes",
+):
+    """
+    Perform a randomization test for the association between x and y.
+
+    The test statistic is Pearson's correlation coefficient, equivalently
+    the slope of the least squares regression line of y on x.
+
+    data_x : tuple
+        Values of the explanatory variable, e.g., the dose of each unit.
+
+    data_y : tuple
+        Responses of the units. Must be of the same length as `data_x`.
+
+    num_permutations : int
+        Number of permutations to be carried out for the randomization test.
+        If `num_permutations > 0`, a Monte Carlo randomization test is
+        performed with the specified number of randomly generated data
+        permutations.  If `num_permutations = -1`, a systematic randomization
+        test is performed, meaning that all n! data permutations are
+        generated.
+
+    alternative : str
+        Alternative hypothesis.
+        Possible values: 'two_sided' (default), 'greater' (positive
+        association), and 'less' (negative association).
+
+    num_jobs : int
+        Number of jobs to carry out the computation.
+
+    log_level : str
+        Set log level.
+        Possible values: 'debug', 'info', 'warn' (default), 'error',
+        and 'critical'.
+
+    seed : None, int, random.Random() instance
+
+    backend : str
+        Worker pool to carry out the computation.
+        Possible values: 'processes' (default) and 'threads'.
+
+    Returns
+    -------
+    RandTestCorrResult object with following attributes
+        method : str
+            Indicates type of randomization test.
+
+        alternative : str
+            Indicates the alternative.
+
+        statistic : float
+            Observed correlation coefficient.
+
+        slope : float
+            Slope of the least squares regression line of y on x.
+
+        num_successes : int
+            Number of successes within generated number of permutations
+            according to the `alternative`.
+
+        num_permutations : int
+            Number of permutations.
+
+        p_value : int
+            The p value is equal to `num_successes / num_permutations`.
+    """
+    if not isinstance(data_x, tuple):
+        data_x = tuple(data_x)
+    if not isinstance(data_y, tuple):
+        data_y = tuple(data_y)
+    assert len(data_x) == len(data_y) > 1
+    check_arguments(
+        num_jobs, log_level, backend, num_permutations, alternative
+    )
+    set_log_level(log_level)
+    n_jobs = get_num_jobs(num_jobs)
+
+    rtest = RandTestCorr(
+        data_x, data_y, num_permutations, alternative, n_jobs, seed, backend
+    )
+    rtest.run()
+    return RandTestCorrResult(
+        rtest.method,
+        rtest.alternative,
+        rtest.tobs,
+        rtest.slope,
+        rtest.num_successes,
+        rtest.num_permutations,
+        seed,
+    )
@@ -0,0 +1,127 @@
+"""
+Module: incremental
+
+Implements:
+ - Incremental Monte Carlo randomization test for data that are appended
+   over time (difference between arithmetic means)
+
+The random assignments of the Monte Carlo randomization test are persisted
+as their sufficient statistic, i.e., the sum of group A. If new units are
+appended, each stored assignment is extended by a random assignment of the
+new units and its sum is updated by the sum of the new units assigned to
+group A. Previous permutation work is therefore never repeated.
+
+Validity
+--------
+The new units of a batch (all units appended between two updates) are only
+permuted among themselves. The reference distribution is therefore the one
+of the stratified randomization test with one stratum per batch, see
+`randtest(..., strata=...)`. This test is valid if the units were
+randomized to the groups within each batch (e.g., per day), and it remains
+valid under a complete randomization of all units, since the assignment is
+then also uniform within the batches conditional on their group sizes.
+
+Each p value is valid on its own. Repeatedly updating the test and stopping
+as soon as the p value falls below the significance level, however, inflates
+the type I error rate like any other form of optional stopping.
+
+"""
+
+from .base import (
+    RandTestResult,
+    is_exact,
+    is_success,
+    rounding_tolerance,
+    check_random_state,
+)
+
+
+class IncrementalRandTest:
+    """
+    IncrementalRandTest Class
+
+    Carries out a Monte Carlo randomization test on data that are appended
+    over time, using the difference between arithmetic means.
+
+    The object can be persisted with pickle between updates.
+    """
+
+    def __init__(
+        self, num_permutations=10000, alternative="two_sided", seed=None
+    ):
+        assert isinstance(num_permutations, int) and num_permutations > 1
+        assert isinstance(alternative, str) and alternative in [
+            "two_sided",
+            "greater",
+            "less",
+        ]
+        self.method = "Monte Carlo"
+        self.alternative = alternative
+        self.seed = seed
+        self.rng = check_random_state(seed)
+
+        # Valid Monte Carlo Randomization Test includes observed tobs
+        # Store one random assignment less
+        self.num_permutations = num_permutations
+        self.sums_group_a = [0] * (num_permutations - 1)
+
+        self.sum_a, self.sum_b = 0, 0
+        self.n_x, self.n_y = 0, 0
+        self.max_abs = 0.0
+        self.exact = True
+        self.num_batches = 0
+        self.pending = {"A": [], "B": []}
+
+    def append(self, group, values):
+        """
+        Append the data of new units to group "A" or group "B".
+        The units appended between two updates form one batch.
+        """
+        assert group in self.pending
+        self.pending[group].extend(values)
+
+    def update(self) -> RandTestResult:
+        """
+        Extend the stored random assignments by the pending batch and
+        return the test result on all units appended so far.
+        """
+        batch_a, batch_b = self.pending["A"], self.pending["B"]
+        # Validate before changing any state: the pending batch is kept
+        assert self.n_x + len(batch_a) > 0 and self.n_y + len(batch_b) > 0
+        if batch_a or batch_b:
+            batch = tuple(batch_a) + tuple(batch_b)
+            n_new = len(batch_a)
+            for j in range(len(self.sums_group_a)):
+                self.sums_group_a[j] += sum(self.rng.sample(batch, n_new))
+            self.sum_a += sum(batch_a)
+            self.sum_b += sum(batch_b)
+            self.n_x += len(batch_a)
+            self.n_y += len(batch_b)
+            self.max_abs = max(self.max_abs, max(abs(x) for x in batch))
+            self.exact = self.exact and is_exact(batch)
+            self.num_batches += 1
+            self.pending = {"A": [], "B": []}
+
+        tobs = self._mean_difference(self.sum_a)
+        # Incrementally updated sums may accumulate rounding errors
+        tol = rounding_tolerance(
+            self.max_abs, self.n_x + self.n_y, self.exact
+        )
+        num_successes = 1 + sum(
+            is_success(self._mean_difference(s), tobs, self.alternative, tol)
+            for s in self.sums_group_a
+        )
+        return RandTestResult(
+            self.method,
+            self.alternative,
+            self.sum_a / self.n_x,
+            self.sum_b / self.n_y,
+            tobs,
+            num_successes,
+            self.num_permutations,
+            self.seed,
+        )
+
+    def _mean_difference(self, sum_a):
+        """Difference between arithmetic means given the sum of group A"""
+        return sum_a / self.n_x - (self.sum_a + self.sum_b - sum_a) / self.n_y
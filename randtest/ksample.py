@@ -0,0 +1,462 @@
+"""
+Module: ksample
+
+Implements:
+ - Systematic k-sample randomization test
+ - Monte Carlo k-sample randomization test
+
+The test statistic is the one-way ANOVA F statistic. Since the total sum of
+squares is invariant under relabeling, F is a monotone function of the
+between-group term sum_g(S_g^2 / n_g), where S_g is the sum of group g.
+Each data permutation therefore only requires the group sums. The
+systematic approach computes the sum of each group once for all
+assignments of the remaining units, and the sum of the last group is the
+total minus the other sums.
+
+Optionally, pairwise follow-up tests (difference between arithmetic means)
+are evaluated on the same data permutations.
+
+"""
+
+import math
+from itertools import combinations
+from .base import (
+    BLOCK_SIZE,
+    INFLIGHT_PER_JOB,
+    RandTestResult,
+    is_success,
+    center_shift,
+    sum_data,
+    sum_tolerance,
+    rounding_tolerance,
+    n_choose_k,
+    iter_blocks,
+    imap_bounded,
+    log_progress,
+    check_random_state,
+    set_log_level,
+    get_pool,
+    get_num_jobs,
+    check_arguments,
+    worker_method,
+)
+
+
+class RandTestKSampleResult:
+    """
+    RandTestKSampleResult class
+
+    Attributes
+    ----------
+        method : str
+            Indicates type of randomization test.
+
+        means : tuple
+            Arithmetic mean of each group.
+
+        statistic : float
+            Observed F statistic value.
+
+        num_successes : int
+            Number of permutations where the F statistic value is larger
+            than or equal to the observed F statistic value.
+
+        num_permutations : int
+            Number of permutations.
+
+        p_value : int
+            The p value is equal to `num_successes / num_permutations`.
+
+        pairwise : dict, None
+            Maps each pair of group indices `(i, j)` to a RandTestResult of
+            the two-sided test on the difference between the arithmetic means
+            of group i and group j, based on the same data permutations.
+
+        seed : int, None,
+    """
+
+    def __init__(
+        self,
+        method: str,
+        means: tuple,
+        statistic: float,
+        num_successes=0,
+        num_permutations=0,
+        pairwise=None,
+        seed=None,
+    ):
+        self._method = method
+        self._means = means
+        self._tobs = statistic
+        self._nhits = num_successes
+        self._nperms = num_permutations
+        self._pairwise = pairwise
+        self._seed = seed
+
+    @property
+    def method(self) -> str:
+        """Getter: method"""
+        return self._method
+
+    @property
+    def means(self) -> tuple:
+        """Getter: means"""
+        return self._means
+
+    @property
+    def statistic(self) -> float:
+        """Getter: statistic"""
+        return self._tobs
+
+    @property
+    def num_successes(self) -> int:
+        """Getter: num_successes"""
+        return self._nhits
+
+    @property
+    def num_permutations(self) -> int:
+        """Getter: num_permutations"""
+        return self._nperms
+
+    @property
+    def p_value(self) -> float:
+        """Getter: p_value"""
+        return self.num_successes / self.num_permutations
+
+    @property
+    def pairwise(self) -> dict:
+        """Getter: pairwise"""
+        return self._pairwise
+
+    @property
+    def seed(self) -> float:
+        """Getter: seed"""
+        return self._seed
+
+    def __repr__(self):
+        repr_string = "{}".format(self.__class__)
+        return repr_string
+
+    def __str__(self):
+        print_string = (
+            "{}\n"
+            + "Method = {}\n"
+            + "Means = ({})\n"
+            + "Observed F statistic value = {:g}\n"
+            + "Number of successes = {:d}\n"
+            + "Number of permutations = {:d}\n"
+            + "p value = {:g}\n"
+            "seed = {}"
+        ).format(
+            self.__class__,
+            self.method,
+            ", ".join("{:g}".format(m) for m in self.means),
+            self.statistic,
+            self.num_successes,
+            self.num_permutations,
+            self.p_value,
+            self.seed,
+        )
+        if self.pairwise is not None:
+            for (i, j), result in sorted(self.pairwise.items()):
+                print_string += "\nGroup {} vs group {}: ".format(i, j)
+                print_string += "p value = {:g}".format(result.p_value)
+        return print_string
+
+
+class RandTestKSample:
+    """
+    RandTestKSample Class
+
+    Carries out the computation of a k-sample randomization test.
+
+    A data permutation is represented by an ordering of the pooled data
+    indices: the first n_1 indices are assigned to group 1, the next n_2
+    indices to group 2, and so on. The systematic approach distributes the
+    assignments of group 1, each completed by all assignments of the
+    remaining indices to the other groups.
+    """
+
+    def __init__(
+        self,
+        groups,
+        num_permutations,
+        pairwise,
+        n_jobs,
+        seed,
+        backend="processes",
+    ):
+        self.method = "Monte Carlo" if num_permutations > 1 else "Systematic"
+        self.njobs = n_jobs
+        self.backend = backend
+        self.rng = check_random_state(seed)
+
+        data = tuple(x for group in groups for x in group)
+        # The F statistic and the mean differences do not change if all
+        # data are shifted: center the data (by an integer shift for ints,
+        # such that their sums stay exact) to keep the sums small
+        shift = center_shift(data)
+        groups = [tuple(x - shift for x in group) for group in groups]
+        self.data = tuple(x for group in groups for x in group)
+        self.sizes = tuple(len(group) for group in groups)
+        self.n_data = len(self.data)
+        self.n_groups = len(groups)
+        self.pairs = (
+            tuple(combinations(range(self.n_groups), 2)) if pairwise else ()
+        )
+        self.tol = sum_tolerance(self.data)
+
+        self.sum_data = sum_data(self.data)
+        sums = tuple(sum_data(group) for group in groups)
+        self.ssb_obs = self._between_group_term(sums)
+        self.mean_diffs_obs = self._mean_diffs(sums)
+        # Each term S_g^2 / n_g is at most n * max|x|^2
+        max_abs = max(abs(x) for x in self.data)
+        self.ssb_tol = rounding_tolerance(
+            self.n_data * max_abs ** 2, self.n_data
+        )
+        self.tobs = self._f_statistic()
+
+        self.num_successes = 0
+        self.pairwise_successes = [0] * len(self.pairs)
+        self.num_permutations = num_permutations
+
+    def compute_block(self, block) -> tuple:
+        """
+        Function to the multiprocessing computation of the test statistic.
+        Returns the number of successes of the F test, the number of
+        successes of each pairwise test, and the number of permutations.
+        """
+        if self.method == "Systematic":
+            all_sums = self._completed_sums(block)
+        else:
+            all_sums = (self._group_sums(order) for order in block)
+        num_successes, num_permutations = 0, 0
+        pairwise_successes = [0] * len(self.pairs)
+        for sums in all_sums:
+            num_permutations += 1
+            num_successes += self._between_group_term(sums) >= (
+                self.ssb_obs - self.ssb_tol
+            )
+            for k, mean_diff in enumerate(self._mean_diffs(sums)):
+                pairwise_successes[k] += is_success(
+                    mean_diff, self.mean_diffs_obs[k], "two_sided", self.tol
+                )
+        return num_successes, pairwise_successes, num_permutations
+
+    def run(self):
+        """Run the multiprocessing computation of randomization test."""
+        if self.method == "Systematic":
+            self.num_permutations = 0
+            orders = combinations(range(self.n_data), self.sizes[0])
+            # Number of data permutations per assignment of group 1
+            num_completions, num_left = 1, self.n_data - self.sizes[0]
+            for size in self.sizes[1:]:
+                num_completions *= n_choose_k(num_left, size)
+                num_left -= size
+            block_size = max(1, BLOCK_SIZE // num_completions)
+        else:
+            # Valid Monte Carlo Randomization Test includes observed tobs
+            self.num_successes += 1
+            self.pairwise_successes = [1] * len(self.pairs)
+            orders = self._get_random_orders()
+            block_size = BLOCK_SIZE
+        with get_pool(self.backend, self.njobs, self) as pool:
+            for (
+                num_successes,
+                pairwise_successes,
+                num_permutations,
+            ) in imap_bounded(
+                pool,
+                worker_method("compute_block"),
+                iter_blocks(orders, block_size),
+                INFLIGHT_PER_JOB * self.njobs,
+            ):
+                self.num_successes += num_successes
+                for k, hits in enumerate(pairwise_successes):
+                    self.pairwise_successes[k] += hits
+                if self.method == "Systematic":
+                    self.num_permutations += num_permutations
+                log_progress(self.num_successes, self.num_permutations)
+
+    def _group_sums(self, order):
+        """Group sums of a data permutation"""
+        sums, start = [], 0
+        for size in self.sizes[:-1]:
+            sums.append(sum(self.data[i] for i in order[start : start + size]))
+            start += size
+        sums.append(self.sum_data - sum(sums))
+        return sums
+
+    def _completed_sums(self, block):
+        """
+        Group sums of all data permutations that assign the indices of a
+        block entry to group 1
+        """
+        for combo in block:
+            chosen = set(combo)
+            rest = tuple(i for i in range(self.n_data) if i not in chosen)
+            yield from self._assignment_sums(
+                rest, self.sizes[1:], (sum(self.data[i] for i in combo),)
+            )
+
+    def _assignment_sums(self, indices, sizes, sums):
+        """
+        Generate the group sums of all distinct assignments of the indices
+        to the remaining groups, given the sums of the groups assigned so
+        far. The sum of a group is computed once for all assignments of the
+        indices left, the sum of the last group is the remainder.
+        """
+        rest_sum = self.sum_data - sum(sums)
+        if len(sizes) == 1:
+            yield sums + (rest_sum,)
+        elif len(sizes) == 2:
+            for combo in combinations(indices, sizes[0]):
+                group_sum = sum(self.data[i] for i in combo)
+                yield sums + (group_sum, rest_sum - group_sum)
+        else:
+            for combo in combinations(indices, sizes[0]):
+                chosen = set(combo)
+                rest = tuple(i for i in indices if i not in chosen)
+                yield from self._assignment_sums(
+                    rest,
+                    sizes[1:],
+                    sums + (sum(self.data[i] for i in combo),),
+                )
+
+    def _between_group_term(self, sums):
+        """Between-group term sum_g(S_g^2 / n_g)"""
+        return sum(s * s / n for s, n in zip(sums, self.sizes))
+
+    def _mean_diffs(self, sums):
+        """Differences between arithmetic means of the pairwise tests"""
+        return [
+            sums[i] / self.sizes[i] - sums[j] / self.sizes[j]
+            for i, j in self.pairs
+        ]
+
+    def _f_statistic(self):
+        """Observed one-way ANOVA F statistic"""
+        total = math.fsum(self.data)
+        ssb = self.ssb_obs - total * total / self.n_data
+        ssw = math.fsum(x * x for x in self.data) - self.ssb_obs
+        df_between = self.n_groups - 1
+        df_within = self.n_data - self.n_groups
+        if ssw <= 0:
+            return math.inf
+        return (ssb / df_between) / (ssw / df_within)
+
+    def _get_random_orders(self):
+        # Valid Monte Carlo Randomization Test includes observed tobs
+        # Generate one random permutation less
+        for _ in range(self.num_permutations - 1):
+            yield tuple(self.rng.sample(range(self.n_data), self.n_data))
+
+
+def randtest_ksample(
+    groups,
+    num_permutations=10000,
+    pairwise=False,
+    num_jobs=1,
+    log_level="warn",
+    seed=None,
+    backend="processes",
+):
+    """
+    Perform a k-sample randomization test with the F statistic.
+
+    groups : list of tuples
+        Data of each group (at least two groups).
+
+    num_permutations : int
+        Number of permutations to be carried out for the randomization test.
+        If `num_permutations > 0`, a Monte Carlo randomization test is
+        performed with the specified number of randomly generated data
+        permutations.  If `num_permutations = -1`, a systematic randomization
+        test is performed, meaning that all possible data permutations are
+        generated.
+
+    pairwise : bool
+        If True, evaluate the two-sided pairwise tests on the difference
+        between arithmetic means based on the same data permutations.
+        Their reference distributions are those under the global null
+        hypothesis that all k groups are exchangeable.
+
+    num_jobs : int
+        Number of jobs to carry out the computation.
+
+    log_level : str
+        Set log level.
+        Possible values: 'debug', 'info', 'warn' (default), 'error',
+        and 'critical'.
+
+    seed : None, int, random.Random() instance
+
+    backend : str
+        Worker pool to carry out the computation.
+        Possible values: 'processes' (default) and 'threads'.
+
+    Returns
+    -------
+    RandTestKSampleResult object with following attributes
+        method : str
+            Indicates type of randomization test.
+
+        means : tuple
+            Arithmetic mean of each group.
+
+        statistic : float
+            Observed F statistic value.
+
+        num_successes : int
+            Number of permutations where the F statistic value is larger
+            than or equal to the observed F statistic value.
+
+        num_permutations : int
+            Number of permutations.
+
+        p_value : int
+            The p value is equal to `num_successes / num_permutations`.
+
+        pairwise : dict, None
+            RandTestResult of each pair of groups if `pairwise=True`.
+    """
+    groups = [
+        group if isinstance(group, tuple) else tuple(group) for group in groups
+    ]
+    assert len(groups) >= 2 and all(len(group) > 0 for group in groups)
+    assert sum(len(group) for group in groups) > len(groups)
+    check_arguments(num_jobs, log_level, backend, num_permutations)
+    assert isinstance(pairwise, bool)
+    set_log_level(log_level)
+    n_jobs = get_num_jobs(num_jobs)
+
+    rtest = RandTestKSample(
+        groups, num_permutations, pairwise, n_jobs, seed, backend
+    )
+    rtest.run()
+    means = tuple(math.fsum(group) / len(group) for group in groups)
+    pairwise_results = None
+    if pairwise:
+        pairwise_results = {
+            (i, j): RandTestResult(
+                rtest.method,
+                "two_sided",
+                means[i],
+                means[j],
+                rtest.mean_diffs_obs[k],
+                rtest.pairwise_successes[k],
+                rtest.num_permutations,
+                seed,
+            )
+            for k, (i, j) in enumerate(rtest.pairs)
+        }
+    return RandTestKSampleResult(
+        rtest.method,
+        means,
+        rtest.tobs,
+        rtest.num_successes,
+        rtest.num_permutations,
+        pairwise_results,
+        seed,
+    )
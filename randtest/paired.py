@@ -0,0 +1,301 @@
+"""
+Module: paired
+
+Implements:
+ - Systematic randomization test for paired data
+ - Monte Carlo randomization test for paired data
+
+Under the null hypothesis, the two responses within a pair are
+exchangeable, so each randomization flips the sign of a subset of the
+within-pair differences. A sign vector is encoded as the bits of an integer:
+bit i set means that the sign of the i-th difference is flipped.
+
+Allows for user-defined:
+ - Measure of central tendency (of the differences)
+
+"""
+
+from statistics import mean
+from .base import (
+    INFLIGHT_PER_JOB,
+    RandTestResult,
+    is_mean,
+    is_exact,
+    is_success,
+    sum_data,
+    rounding_tolerance,
+    iter_blocks,
+    imap_bounded,
+    log_progress,
+    check_random_state,
+    set_log_level,
+    get_pool,
+    get_num_jobs,
+    check_arguments,
+    worker_method,
+)
+from .specs import get_statistic
+
+# Number of sign vectors evaluated per task
+BLOCK_SIZE = 4096
+
+
+class RandTestPaired:
+    """
+    RandTestPaired Class
+
+    Carries out the computation of a paired randomization test.
+
+    In the systematic approach, all 2^n sign vectors are enumerated in
+    Gray-code order such that consecutive sign vectors differ by exactly one
+    sign flip. If the measure of central tendency is the arithmetic mean,
+    the sum of the differences is then updated in O(1) per sign vector.
+    In the Monte Carlo approach, random sign vectors are evaluated in blocks
+    with per-byte lookup tables of the flipped sums.
+    """
+
+    def __init__(
+        self,
+        data_group_a,
+        data_group_b,
+        mct,
+        num_permutations,
+        alternative,
+        n_jobs,
+        seed,
+        backend="processes",
+    ):
+        self.mct = mct
+        self.method = "Monte Carlo" if num_permutations > 1 else "Systematic"
+        self.alternative = alternative
+        self.njobs = n_jobs
+        self.backend = backend
+        self.rng = check_random_state(seed)
+
+        self.diffs = tuple(a - b for a, b in zip(data_group_a, data_group_b))
+        self.n_pairs = len(self.diffs)
+        self.tobs = self.mct(d for d in self.diffs)
+
+        self.sum_based = is_mean(mct)
+        self.sum_diffs = sum_data(self.diffs)
+        # Tolerance of the sums (n times the mean): a sum of the Gray-code
+        # walk accumulates up to BLOCK_SIZE updates
+        self.tol = self.n_pairs * rounding_tolerance(
+            max(abs(d) for d in self.diffs),
+            self.n_pairs + BLOCK_SIZE,
+            is_exact(self.diffs),
+        )
+        self.tables = self._get_byte_tables()
+
+        self.num_successes = 0
+        self.num_permutations = num_permutations
+
+    def compute_block(self, block) -> tuple:
+        """
+        Function to the multiprocessing computation of the test statistic.
+        Returns the number of successes and the number of evaluated sign
+        vectors of the block.
+        """
+        num_successes, num_permutations = 0, 0
+        if self.sum_based:
+            tobs_sum = self.sum_diffs
+            for sum_flipped in self._flipped_sums(block):
+                num_successes += is_success(
+                    sum_flipped, tobs_sum, self.alternative, self.tol
+                )
+                num_permutations += 1
+        else:
+            if self.method == "Systematic":
+                signs = (sign for sign, _ in self._gray_code_walk(*block))
+            else:
+                signs = block
+            for sign in signs:
+                num_successes += is_success(
+                    self._compute_mct(sign), self.tobs, self.alternative
+                )
+                num_permutations += 1
+        return num_successes, num_permutations
+
+    def run(self):
+        """Run the multiprocessing computation of randomization test."""
+        if self.method == "Systematic":
+            self.num_permutations = 0
+            blocks = (
+                (start, min(start + BLOCK_SIZE, 2 ** self.n_pairs))
+                for start in range(0, 2 ** self.n_pairs, BLOCK_SIZE)
+            )
+        else:
+            # Valid Monte Carlo Randomization Test includes observed tobs
+            self.num_successes += 1
+            blocks = self._get_random_sign_blocks()
+        with get_pool(self.backend, self.njobs, self) as pool:
+            for num_successes, num_permutations in imap_bounded(
+                pool,
+                worker_method("compute_block"),
+                blocks,
+                INFLIGHT_PER_JOB * self.njobs,
+            ):
+                self.num_successes += num_successes
+                if self.method == "Systematic":
+                    self.num_permutations += num_permutations
+                log_progress(self.num_successes, self.num_permutations)
+
+    def _compute_mct(self, sign):
+        """Compute the MCT of the differences with flipped signs"""
+        return self.mct(
+            -d if sign >> i & 1 else d for i, d in enumerate(self.diffs)
+        )
+
+    def _gray_code_walk(self, start, stop):
+        """
+        Yield the sign vectors with Gray-code index in [start, stop) as pairs
+        of (sign vector, index of the flipped bit). The first sign vector of
+        the block carries the index -1, since it is not reached by one flip.
+        """
+        sign = start ^ (start >> 1)
+        yield sign, -1
+        for k in range(start + 1, stop):
+            i = (k & -k).bit_length() - 1
+            sign ^= 1 << i
+            yield sign, i
+
+    def _flipped_sums(self, block):
+        """Yield the sums of the differences with flipped signs"""
+        if self.method == "Systematic":
+            sum_flipped = 0
+            for sign, i in self._gray_code_walk(*block):
+                if i < 0:
+                    sum_flipped = self._lookup_sum(sign)
+                elif sign >> i & 1:
+                    sum_flipped -= 2 * self.diffs[i]
+                else:
+                    sum_flipped += 2 * self.diffs[i]
+                yield sum_flipped
+        else:
+            for sign in block:
+                yield self._lookup_sum(sign)
+
+    def _lookup_sum(self, sign):
+        """Sum of the differences with flipped signs via byte lookup tables"""
+        return self.sum_diffs - sum(
+            table[sign >> (8 * j) & 255] for j, table in enumerate(self.tables)
+        )
+
+    def _get_byte_tables(self):
+        """
+        For the j-th byte of a sign vector, the table holds the amount by
+        which the sum of the differences decreases if the signs of the
+        corresponding eight differences are flipped.
+        """
+        tables = []
+        for j in range(0, self.n_pairs, 8):
+            diffs = self.diffs[j : j + 8]
+            table = [0] * 2 ** len(diffs)
+            for b in range(1, len(table)):
+                i = (b & -b).bit_length() - 1
+                table[b] = table[b & (b - 1)] + 2 * diffs[i]
+            tables.append(table + [0] * (256 - len(table)))
+        return tables
+
+    def _get_random_sign_blocks(self):
+        # Valid Monte Carlo Randomization Test includes observed tobs
+        # Generate one random sign vector less
+        signs = (
+            self.rng.getrandbits(self.n_pairs)
+            for _ in range(self.num_permutations - 1)
+        )
+        return iter_blocks(signs, BLOCK_SIZE)
+
+
+def randtest_paired(
+    data_group_a,
+    data_group_b,
+    mct=mean,
+    num_permutations=10000,
+    alternative="two_sided",
+    num_jobs=1,
+    log_level="warn",
+    seed=None,
+    backend="processes",
+):
+    """
+    Perform a randomization test for paired data.
+
+    The test statistic is the measure of central tendency of the within-pair
+    differences `data_group_a[i] - data_group_b[i]`.
+
+    data_group_a : tuple
+        Data of group A, e.g., the responses after treatment.
+
+    data_group_b : tuple
+        Data of group B, e.g., the responses before treatment.
+        Must be of the same length as `data_group_a`.
+
+    mct : function, StatisticSpec, str
+        Measure of central tendency of the differences, see randtest.randtest()
+        for specifications of registered statistics.
+        Default: mean().
+
+    num_permutations : int
+        Number of permutations to be carried out for the randomization test.
+        If `num_permutations > 0`, a Monte Carlo randomization test is
+        performed with the specified number of randomly generated sign
+        vectors. If `num_permutations = -1`, a systematic randomization
+        test is performed, meaning that all 2^n sign vectors are generated.
+
+    alternative : str
+        Alternative hypothesis.
+        Possible values: 'two_sided' (default), 'greater', and 'less'.
+
+    num_jobs : int
+        Number of jobs to carry out the computation.
+
+    log_level : str
+        Set log level.
+        Possible values: 'debug', 'info', 'warn' (default), 'error',
+        and 'critical'.
+
+    seed : None, int, random.Random() instance
+
+    backend : str
+        Worker pool to carry out the computation.
+        Possible values: 'processes' (default) and 'threads'.
+
+    Returns
+    -------
+    RandTestResult object, see randtest.randtest().
+    The `statistic` is the MCT of the within-pair differences.
+    """
+    if not isinstance(data_group_a, tuple):
+        data_group_a = tuple(data_group_a)
+    if not isinstance(data_group_b, tuple):
+        data_group_b = tuple(data_group_b)
+    assert len(data_group_a) == len(data_group_b) > 0
+    mct = get_statistic(mct)
+    check_arguments(
+        num_jobs, log_level, backend, num_permutations, alternative
+    )
+    set_log_level(log_level)
+    n_jobs = get_num_jobs(num_jobs)
+
+    rtest = RandTestPaired(
+        data_group_a,
+        data_group_b,
+        mct,
+        num_permutations,
+        alternative,
+        n_jobs,
+        seed,
+        backend,
+    )
+    rtest.run()
+    return RandTestResult(
+        rtest.method,
+        rtest.alternative,
+        mct(data_group_a),
+        mct(data_group_b),
+        rtest.tobs,
+        rtest.num_successes,
+        rtest.num_permutations,
+        seed,
+    )
@@ -0,0 +1,241 @@
+"""
+Module: planner
+
+Implements:
+ - Planning of a randomization test w.r.t. a time budget
+
+The planner counts the data permutations of the systematic approach and
+times a short calibration run of the test statistic. Based on the measured
+time per data permutation, it selects
+
+ - the method: the systematic approach if all data permutations can be
+   evaluated within the time budget, the Monte Carlo approach otherwise,
+ - the number of permutations that fit into the time budget,
+ - the number of jobs: additional workers are only started if there is
+   enough work to amortize their startup, and
+ - the block size: each task takes roughly `TASK_SECONDS`, while every job
+   still receives several tasks.
+
+"""
+
+import math
+import time
+
+# Minimum duration of the calibration run in seconds
+CALIBRATION_SECONDS = 0.05
+
+# Maximum number of data permutations of the calibration run
+CALIBRATION_SIZE = 10000
+
+# Target duration of a single task in seconds
+TASK_SECONDS = 0.05
+
+# Minimum amount of work per job in seconds to amortize the worker startup
+MIN_SECONDS_PER_JOB = 0.5
+
+# Bounds of the number of permutations of the Monte Carlo approach
+MIN_PERMUTATIONS = 1000
+MAX_PERMUTATIONS = 1000000
+
+# Minimum number of tasks per job
+TASKS_PER_JOB = 4
+
+# Bounds of the number of data permutations per task
+MIN_BLOCK_SIZE = 10
+MAX_BLOCK_SIZE = 100000
+
+
+class RandTestPlan:
+    """
+    RandTestPlan class
+
+    Attributes
+    ----------
+        method : str
+            Indicates type of randomization test.
+
+        num_permutations : int
+            Number of permutations to be passed to the randomization test,
+            i.e., -1 for the systematic approach.
+
+        num_total : int
+            Number of data permutations of the systematic approach.
+
+        num_jobs : int
+            Number of jobs to carry out the computation.
+
+        block_size : int
+            Number of data permutations evaluated per task.
+
+        seconds_per_permutation : float
+            Measured time to evaluate a single data permutation.
+
+        estimated_seconds : float
+            Estimated duration of the randomization test.
+
+        max_seconds : float, None
+            Time budget (None if the number of permutations is fixed).
+    """
+
+    def __init__(
+        self,
+        method: str,
+        num_permutations: int,
+        num_total: int,
+        num_jobs: int,
+        block_size: int,
+        seconds_per_permutation: float,
+        estimated_seconds: float,
+        max_seconds=None,
+    ):
+        self._method = method
+        self._nperms = num_permutations
+        self._ntotal = num_total
+        self._njobs = num_jobs
+        self._block_size = block_size
+        self._spp = seconds_per_permutation
+        self._estimated = estimated_seconds
+        self._max_seconds = max_seconds
+
+    @property
+    def method(self) -> str:
+        """Getter: method"""
+        return self._method
+
+    @property
+    def num_permutations(self) -> int:
+        """Getter: num_permutations"""
+        return self._nperms
+
+    @property
+    def num_total(self) -> int:
+        """Getter: num_total"""
+        return self._ntotal
+
+    @property
+    def num_jobs(self) -> int:
+        """Getter: num_jobs"""
+        return self._njobs
+
+    @property
+    def block_size(self) -> int:
+        """Getter: block_size"""
+        return self._block_size
+
+    @property
+    def seconds_per_permutation(self) -> float:
+        """Getter: seconds_per_permutation"""
+        return self._spp
+
+    @property
+    def estimated_seconds(self) -> float:
+        """Getter: estimated_seconds"""
+        return self._estimated
+
+    @property
+    def max_seconds(self) -> float:
+        """Getter: max_seconds"""
+        return self._max_seconds
+
+    def __repr__(self):
+        repr_string = "{}".format(self.__class__)
+        return repr_string
+
+    def __str__(self):
+        print_string = (
+            "{}\n"
+            + "Method = {}\n"
+            + "Number of permutations = {:d}\n"
+            + "Number of data permutations (systematic) = {:d}\n"
+            + "Number of jobs = {:d}\n"
+            + "Block size = {:d}\n"
+            + "Seconds per permutation = {:g}\n"
+            + "Estimated seconds = {:g}\n"
+            "Max seconds = {}"
+        ).format(
+            self.__class__,
+            self.method,
+            self.num_permutations,
+            self.num_total,
+            self.num_jobs,
+            self.block_size,
+            self.seconds_per_permutation,
+            self.estimated_seconds,
+            self.max_seconds,
+        )
+        return print_string
+
+
+def calibrate(evaluate) -> float:
+    """
+    Measure the time to generate and evaluate a single random data
+    permutation, where `evaluate(size)` generates and evaluates `size`
+    random data permutations. The calibration run is doubled until it
+    takes `CALIBRATION_SECONDS`.
+    """
+    size = 1
+    while True:
+        start = time.perf_counter()
+        evaluate(size)
+        elapsed = time.perf_counter() - start
+        if elapsed >= CALIBRATION_SECONDS or size >= CALIBRATION_SIZE:
+            return elapsed / size
+        size *= 2
+
+
+def plan(
+    evaluate,
+    num_total,
+    num_permutations,
+    max_seconds,
+    n_jobs,
+    num_evaluations=None,
+) -> RandTestPlan:
+    """
+    Plan a randomization test with `num_total` data permutations in the
+    systematic approach and at most `n_jobs` jobs, see calibrate() for
+    `evaluate`. The systematic approach evaluates the test statistic
+    `num_evaluations` times (default: `num_total`), which is less than
+    `num_total` if data permutations with the same test statistic value are
+    evaluated only once. If `max_seconds` is None, the method and the number
+    of permutations follow `num_permutations`, and only the number of jobs
+    and the block size are planned.
+    """
+    if num_evaluations is None:
+        num_evaluations = num_total
+    seconds_per_permutation = calibrate(evaluate)
+    if max_seconds is None:
+        method = "Monte Carlo" if num_permutations > 1 else "Systematic"
+    else:
+        capacity = max_seconds * n_jobs / seconds_per_permutation
+        # Prefer the systematic approach if it is not more expensive than
+        # the smallest Monte Carlo randomization test
+        if num_evaluations <= max(capacity, MIN_PERMUTATIONS):
+            method, num_permutations = "Systematic", -1
+        else:
+            method = "Monte Carlo"
+            num_permutations = int(
+                min(MAX_PERMUTATIONS, max(MIN_PERMUTATIONS, capacity))
+            )
+    # Valid Monte Carlo Randomization Test includes observed tobs
+    num_draws = num_permutations - 1
+    if method == "Systematic":
+        num_draws = num_evaluations
+
+    serial_seconds = num_draws * seconds_per_permutation
+    num_jobs = int(min(n_jobs, max(1, serial_seconds // MIN_SECONDS_PER_JOB)))
+    block_size = min(
+        int(TASK_SECONDS / seconds_per_permutation),
+        math.ceil(num_draws / (TASKS_PER_JOB * num_jobs)),
+    )
+    block_size = min(MAX_BLOCK_SIZE, max(MIN_BLOCK_SIZE, block_size))
+    return RandTestPlan(
+        method,
+        num_permutations,
+        num_total,
+        num_jobs,
+        block_size,
+        seconds_per_permutation,
+        serial_seconds / num_jobs,
+        max_seconds,
+    )
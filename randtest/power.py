@@ -0,0 +1,409 @@
+"""
+Module: power
+
+Implements:
+ - Power estimation of the Monte Carlo randomization test by simulation
+
+Each simulation draws a data set of group A and group B from the given
+distribution, where the data of group A are shifted by the effect, and
+carries out a Monte Carlo randomization test on it. The power is estimated
+by the fraction of simulations where the null hypothesis is rejected.
+
+The random data permutations are drawn once and shared by all simulations.
+Since they are drawn independently of the data, each randomization test
+remains valid, while the simulations are evaluated in blocks without
+drawing new data permutations. Each simulation draws its data set from its
+own random number generator, such that the results do not depend on the
+number of jobs. As the simulations share the data permutations, their
+rejections are correlated: the standard error of the power is conditional
+on the drawn data permutations and does not include the variability of
+drawing them, which decreases with the number of permutations.
+
+"""
+
+import math
+from statistics import mean
+from .base import (
+    INFLIGHT_PER_JOB,
+    RandTest,
+    test_statistic,
+    iter_blocks,
+    imap_bounded,
+    check_random_state,
+    set_log_level,
+    get_pool,
+    get_num_jobs,
+    check_arguments,
+    worker_method,
+)
+from .specs import get_statistic
+
+# Number of simulations per task
+SIMULATIONS_PER_TASK = 10
+
+
+class RandTestPowerResult:
+    """
+    RandTestPowerResult class
+
+    Attributes
+    ----------
+        alternative : str
+            Indicates the alternative.
+
+        effect : float
+            Shift of group A relative to group B.
+
+        sizes : tuple
+            Number of units of group A and of group B.
+
+        alpha : float
+            Significance level.
+
+        num_rejections : int
+            Number of simulations where the null hypothesis is rejected.
+
+        num_simulations : int
+            Number of simulated data sets.
+
+        num_permutations : int
+            Number of permutations of each randomization test.
+
+        power : float
+            The power is equal to `num_rejections / num_simulations`.
+
+        power_se : float
+            Monte Carlo standard error of the power, conditional on the
+            shared data permutations.
+
+        seed : int, None,
+    """
+
+    def __init__(
+        self,
+        alternative: str,
+        effect: float,
+        sizes: tuple,
+        alpha: float,
+        num_rejections=0,
+        num_simulations=0,
+        num_permutations=0,
+        seed=None,
+    ):
+        self._alternative = alternative
+        self._effect = effect
+        self._sizes = sizes
+        self._alpha = alpha
+        self._nrejections = num_rejections
+        self._nsims = num_simulations
+        self._nperms = num_permutations
+        self._seed = seed
+
+    @property
+    def alternative(self) -> str:
+        """Getter: alternative"""
+        return self._alternative
+
+    @property
+    def effect(self) -> float:
+        """Getter: effect"""
+        return self._effect
+
+    @property
+    def sizes(self) -> tuple:
+        """Getter: sizes"""
+        return self._sizes
+
+    @property
+    def alpha(self) -> float:
+        """Getter: alpha"""
+        return self._alpha
+
+    @property
+    def num_rejections(self) -> int:
+        """Getter: num_rejections"""
+        return self._nrejections
+
+    @property
+    def num_simulations(self) -> int:
+        """Getter: num_simulations"""
+        return self._nsims
+
+    @property
+    def num_permutations(self) -> int:
+        """Getter: num_permutations"""
+        return self._nperms
+
+    @property
+    def power(self) -> float:
+        """Getter: power"""
+        return self.num_rejections / self.num_simulations
+
+    @property
+    def power_se(self) -> float:
+        """Getter: power_se"""
+        return math.sqrt(self.power * (1 - self.power) / self.num_simulations)
+
+    @property
+    def seed(self) -> float:
+        """Getter: seed"""
+        return self._seed
+
+    def __repr__(self):
+        repr_string = "{}".format(self.__class__)
+        return repr_string
+
+    def __str__(self):
+        print_string = (
+            "{}\n"
+            + "Alternative = {}\n"
+            + "Effect = {:g}\n"
+            + "Group sizes = ({:d}, {:d})\n"
+            + "Significance level = {:g}\n"
+            + "Number of rejections = {:d}\n"
+            + "Number of simulations = {:d}\n"
+            + "Number of permutations = {:d}\n"
+            + "Power = {:g} +/- {:g}\n"
+            "seed = {}"
+        ).format(
+            self.__class__,
+            self.alternative,
+            self.effect,
+            self.sizes[0],
+            self.sizes[1],
+            self.alpha,
+            self.num_rejections,
+            self.num_simulations,
+            self.num_permutations,
+            self.power,
+            self.power_se,
+            self.seed,
+        )
+        return print_string
+
+
+class RandTestPower:
+    """
+    RandTestPower Class
+
+    Carries out the simulation of randomization tests for power estimation.
+    """
+
+    def __init__(
+        self,
+        size_a,
+        size_b,
+        effect,
+        distribution,
+        mct,
+        tstat,
+        num_simulations,
+        num_permutations,
+        alpha,
+        alternative,
+        n_jobs,
+        seed,
+        backend="processes",
+    ):
+        self.size_a = size_a
+        self.size_b = size_b
+        self.effect = effect
+        self.distribution = distribution
+        self.mct = mct
+        self.tstat = tstat
+        self.alpha = alpha
+        self.alternative = alternative
+        self.njobs = n_jobs
+        self.backend = backend
+        self.rng = check_random_state(seed)
+
+        self.num_simulations = num_simulations
+        self.num_permutations = num_permutations
+        # Seed of the random number generator of the first simulation
+        self.data_seed = self.rng.getrandbits(64)
+        # Valid Monte Carlo Randomization Test includes observed tobs
+        # Draw one random permutation less, shared by all simulations
+        n_data = size_a + size_b
+        self.indices = tuple(
+            tuple(self.rng.sample(range(n_data), size_a))
+            for _ in range(num_permutations - 1)
+        )
+        self.num_rejections = 0
+
+    def compute_simulations(self, simulations) -> int:
+        """
+        Function to the multiprocessing computation of a block of
+        simulations. Returns the number of rejections.
+        """
+        num_rejections = 0
+        for simulation in simulations:
+            data_group_a, data_group_b = self.simulate(simulation)
+            rtest = RandTest(
+                data_group_a,
+                data_group_b,
+                self.mct,
+                self.tstat,
+                self.num_permutations,
+                self.alternative,
+                1,
+                None,
+            )
+            num_successes, _, _ = rtest.compute_block(self.indices)
+            p_value = (1 + num_successes) / self.num_permutations
+            num_rejections += p_value <= self.alpha
+        return num_rejections
+
+    def simulate(self, simulation) -> tuple:
+        """Draw the data set of a simulation"""
+        rng = check_random_state(self.data_seed + simulation)
+        data_group_a = tuple(
+            self.distribution(rng) + self.effect for _ in range(self.size_a)
+        )
+        data_group_b = tuple(
+            self.distribution(rng) for _ in range(self.size_b)
+        )
+        return data_group_a, data_group_b
+
+    def run(self):
+        """Run the multiprocessing computation of the simulations."""
+        blocks = iter_blocks(range(self.num_simulations), SIMULATIONS_PER_TASK)
+        with get_pool(self.backend, self.njobs, self) as pool:
+            for num_rejections in imap_bounded(
+                pool,
+                worker_method("compute_simulations"),
+                blocks,
+                INFLIGHT_PER_JOB * self.njobs,
+            ):
+                self.num_rejections += num_rejections
+
+
+def standard_normal(rng) -> float:
+    """Draw from the standard normal distribution"""
+    return rng.gauss(0.0, 1.0)
+
+
+def randtest_power(
+    size_a,
+    size_b,
+    effect,
+    distribution=standard_normal,
+    mct=mean,
+    tstat=test_statistic,
+    num_simulations=1000,
+    num_permutations=1000,
+    alpha=0.05,
+    alternative="two_sided",
+    num_jobs=1,
+    log_level="warn",
+    seed=None,
+    backend="processes",
+):
+    """
+    Estimate the power of the Monte Carlo randomization test by simulation.
+
+    size_a : int
+        Number of units of group A.
+
+    size_b : int
+        Number of units of group B.
+
+    effect : float
+        Shift of the data of group A relative to the data of group B.
+        With `effect=0`, the rejection rate estimates the type I error rate.
+
+    distribution : function
+        Draws a single value given a random.Random() instance, e.g.,
+        `lambda rng: rng.expovariate(1.0)`. With the 'processes' backend
+        and the 'spawn' start method, use a module-level function.
+        Default: standard normal distribution.
+
+    mct : function, StatisticSpec, str
+        Measure of central tendency, see randtest.randtest().
+
+    tstat : function, StatisticSpec, str
+        Test statistic, see randtest.randtest().
+
+    num_simulations : int
+        Number of simulated data sets.
+
+    num_permutations : int
+        Number of permutations of each Monte Carlo randomization test.
+        The random data permutations are shared by all simulations.
+
+    alpha : float
+        Significance level: the null hypothesis is rejected if the p value
+        is smaller than or equal to `alpha`.
+
+    alternative : str
+        Alternative hypothesis.
+        Possible values: 'two_sided' (default), 'greater', and 'less'.
+
+    num_jobs : int
+        Number of jobs to carry out the computation.
+
+    log_level : str
+        Set log level.
+        Possible values: 'debug', 'info', 'warn' (default), 'error',
+        and 'critical'.
+
+    seed : None, int, random.Random() instance
+
+    backend : str
+        Worker pool to carry out the computation.
+        Possible values: 'processes' (default) and 'threads'.
+
+    Returns
+    -------
+    RandTestPowerResult object with following attributes
+        power : float
+            Fraction of simulations where the null hypothesis is rejected.
+
+        power_se : float
+            Monte Carlo standard error of the power over the simulated data
+            sets, conditional on the shared data permutations, i.e., without
+            the variability of drawing the data permutations.
+
+        num_rejections : int
+            Number of simulations where the null hypothesis is rejected.
+
+        num_simulations : int
+            Number of simulated data sets.
+    """
+    assert isinstance(size_a, int) and size_a > 0
+    assert isinstance(size_b, int) and size_b > 0
+    assert isinstance(effect, (int, float))
+    assert callable(distribution)
+    mct, tstat = get_statistic(mct), get_statistic(tstat)
+    assert isinstance(num_simulations, int) and num_simulations > 0
+    assert isinstance(num_permutations, int) and num_permutations > 1
+    assert isinstance(alpha, float) and 0 < alpha < 1
+    check_arguments(num_jobs, log_level, backend, alternative=alternative)
+    set_log_level(log_level)
+    n_jobs = get_num_jobs(num_jobs)
+
+    rtest = RandTestPower(
+        size_a,
+        size_b,
+        effect,
+        distribution,
+        mct,
+        tstat,
+        num_simulations,
+        num_permutations,
+        alpha,
+        alternative,
+        n_jobs,
+        seed,
+        backend,
+    )
+    rtest.run()
+    return RandTestPowerResult(
+        alternative,
+        effect,
+        (size_a, size_b),
+        alpha,
+        rtest.num_rejections,
+        num_simulations,
+        num_permutations,
+        seed,
+    )
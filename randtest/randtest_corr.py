@@ -0,0 +1,63 @@
+"""
+Make Randomization test for association (`randtest-corr`)
+available on the command line.
+"""
+
+from .correlation import randtest_corr
+from .argparser_bp import (
+    read_data,
+    argparse_cli,
+    add_client,
+    check_client,
+    data_files,
+)
+from .server import request_test
+
+
+def main():
+    """Main function"""
+    description = """
+    Randomization test for the association between an explanatory variable
+    x (e.g., the dose) and a response y gathered in a controlled experiment.
+    The test statistic is Pearson's correlation coefficient. The i-th line
+    of both files must refer to the same unit.
+    """
+    parser = add_client(
+        argparse_cli(
+            description,
+            help_a="file name x data (e.g., dose).",
+            help_b="file name y data (responses).",
+        )
+    )
+    args = parser.parse_args()
+    check_client(parser, args)
+    if args.server is not None:
+        response = request_test(
+            args.server,
+            {
+                "test": "corr",
+                "files": data_files(args),
+                "num_permutations": args.p,
+                "alternative": args.a,
+                "seed": args.s,
+            },
+        )
+        print(response["text"])
+        return
+    data_x = read_data(args.fname_data_A)
+    data_y = read_data(args.fname_data_B)
+    result = randtest_corr(
+        data_x=data_x,
+        data_y=data_y,
+        num_permutations=args.p,
+        alternative=args.a,
+        num_jobs=args.n,
+        log_level=args.l,
+        seed=args.s,
+        backend=args.b,
+    )
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,17 @@ available on the command line.
 """
 
 from statistics import mean
-from .base import randtest, test_statistic
-from .argparser_bp import read_data, argparse_cli
+from .base import randtest, plan_randtest, test_statistic
+from .argparser_bp import (
+    read_data,
+    argparse_cli,
+    add_tail_approximation,
+    add_planner,
+    add_client,
+    check_client,
+    data_files,
+)
+from .server import request_test
 
 
 def main():
@@ -14,10 +23,43 @@ def main():
     Randomization test for the comparison of arithmetic means computed
     based on two independent samples gathered in a controlled experiment.
     """
-    parser = argparse_cli(description)
+    parser = add_client(
+        add_planner(add_tail_approximation(argparse_cli(description)))
+    )
     args = parser.parse_args()
+    check_client(parser, args)
+    if args.server is not None and not args.dry_run:
+        response = request_test(
+            args.server,
+            {
+                "test": "randtest",
+                "files": data_files(args),
+                "mct": "mean",
+                "num_permutations": args.p,
+                "alternative": args.a,
+                "seed": args.s,
+                "tail_approximation": args.tail_approximation,
+                "max_seconds": args.max_seconds,
+            },
+        )
+        print(response["text"])
+        return
     data_group_a = read_data(args.fname_data_A)
     data_group_b = read_data(args.fname_data_B)
+    if args.dry_run:
+        print(
+            plan_randtest(
+                data_group_a=tuple(data_group_a),
+                data_group_b=tuple(data_group_b),
+                mct=mean,
+                tstat=test_statistic,
+                num_permutations=args.p,
+                num_jobs=args.n,
+                max_seconds=args.max_seconds,
+            )
+        )
+        return
+
     result = randtest(
         data_group_a=data_group_a,
         data_group_b=data_group_b,
@@ -28,8 +70,13 @@ def main():
         num_jobs=args.n,
         log_level=args.l,
         seed=args.s,
+        backend=args.b,
+        tail_approximation=args.tail_approximation,
+        max_seconds=args.max_seconds,
     )
     print(result)
+    if result.plan is not None:
+        print(result.plan)
 
 
 if __name__ == "__main__":
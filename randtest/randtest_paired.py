@@ -0,0 +1,60 @@
+"""
+Make Randomization test for paired data (`randtest-paired`)
+available on the command line.
+"""
+
+from statistics import mean
+from .paired import randtest_paired
+from .argparser_bp import (
+    read_data,
+    argparse_cli,
+    add_client,
+    check_client,
+    data_files,
+)
+from .server import request_test
+
+
+def main():
+    """Main function"""
+    description = """
+    Randomization test for the comparison of two paired samples gathered in
+    a controlled experiment (e.g., before/after on the same unit). The test
+    statistic is the arithmetic mean of the within-pair differences. The
+    i-th line of both files must refer to the same unit.
+    """
+    parser = add_client(argparse_cli(description))
+    args = parser.parse_args()
+    check_client(parser, args)
+    if args.server is not None:
+        response = request_test(
+            args.server,
+            {
+                "test": "paired",
+                "files": data_files(args),
+                "mct": "mean",
+                "num_permutations": args.p,
+                "alternative": args.a,
+                "seed": args.s,
+            },
+        )
+        print(response["text"])
+        return
+    data_group_a = read_data(args.fname_data_A)
+    data_group_b = read_data(args.fname_data_B)
+    result = randtest_paired(
+        data_group_a=data_group_a,
+        data_group_b=data_group_b,
+        mct=mean,
+        num_permutations=args.p,
+        alternative=args.a,
+        num_jobs=args.n,
+        log_level=args.l,
+        seed=args.s,
+        backend=args.b,
+    )
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
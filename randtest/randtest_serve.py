@@ -0,0 +1,58 @@
+"""
+Make the randtest server (`randtest-serve`) available on the command line.
+"""
+
+import signal
+import argparse
+import textwrap
+from randtest import __version__
+from .base import set_log_level
+from .server import serve
+
+
+def stop(signum, frame):
+    """Leave the server loop on SIGTERM, such that the socket is removed"""
+    raise SystemExit(0)
+
+
+def main():
+    """Main function"""
+    description = """
+    Long-running randtest server. Keeps a warm worker pool and serves test
+    requests in the JSON lines format on a local Unix socket, see
+    randtest.server. Pass `--server SOCKET` to randtest-mean, randtest-tmean,
+    randtest-paired, or randtest-corr to send their tests to the server.
+    """
+    parser = argparse.ArgumentParser(description=textwrap.dedent(description))
+    parser.add_argument(
+        "-v", "--version", action="version", version=__version__,
+    )
+    parser.add_argument(
+        "-n",
+        metavar="num_jobs",
+        type=int,
+        default=1,
+        help="number of tests carried out at a time (default: 1).",
+    )
+    parser.add_argument(
+        "-l",
+        metavar="log_level",
+        type=str,
+        choices=["debug", "info", "warn", "error", "critical"],
+        default="warn",
+        help="set log level (default: 'warn').",
+    )
+    parser.add_argument(
+        "socket", type=str, help="file name of the Unix socket.",
+    )
+    args = parser.parse_args()
+    set_log_level(args.l)
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        serve(args.socket, num_jobs=args.n)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,18 @@ Make Randomization test with trimmed mean difference (`randtest-tmean`)
 available on the command line.
 """
 
-from functools import partial
-from .base import randtest, test_statistic
-from .mcts import trimmed_mean
-from .argparser_bp import read_data, argparse_cli
+from .base import randtest, plan_randtest, test_statistic
+from .specs import StatisticSpec
+from .argparser_bp import (
+    read_data,
+    argparse_cli,
+    add_tail_approximation,
+    add_planner,
+    add_client,
+    check_client,
+    data_files,
+)
+from .server import request_test
 
 
 def main():
@@ -15,7 +23,9 @@ def main():
     Randomization test for the comparison of trimmed means computed
     based on two independent samples gathered in a controlled experiment.
     """
-    parser = argparse_cli(description)
+    parser = add_client(
+        add_planner(add_tail_approximation(argparse_cli(description)))
+    )
     parser.add_argument(
         "-t",
         metavar="[0-49]",
@@ -25,13 +35,46 @@ def main():
         help="value in percent used for trimming (default: 20).",
     )
     args = parser.parse_args()
+    check_client(parser, args)
     alpha = args.t / 100
-    # Use functools.partial to set parameters
-    tmean = partial(trimmed_mean, trim_percent=alpha)
+    # Use a statistic specification to set parameters
+    tmean = StatisticSpec("trimmed_mean", trim_percent=alpha)
+
+    if args.server is not None and not args.dry_run:
+        response = request_test(
+            args.server,
+            {
+                "test": "randtest",
+                "files": data_files(args),
+                "mct": tmean.name,
+                "mct_params": tmean.params,
+                "num_permutations": args.p,
+                "alternative": args.a,
+                "seed": args.s,
+                "tail_approximation": args.tail_approximation,
+                "max_seconds": args.max_seconds,
+            },
+        )
+        print(response["text"])
+        return
 
     data_group_a = read_data(args.fname_data_A)
     data_group_b = read_data(args.fname_data_B)
 
+    if args.dry_run:
+        print(
+            plan_randtest(
+                data_group_a=tuple(data_group_a),
+                data_group_b=tuple(data_group_b),
+                mct=tmean,
+                tstat=test_statistic,
+                num_permutations=args.p,
+                num_jobs=args.n,
+                max_seconds=args.max_seconds,
+            )
+        )
+        return
+
     result = randtest(
         data_group_a=data_group_a,
         data_group_b=data_group_b,
@@ -42,8 +85,13 @@ def main():
         num_jobs=args.n,
         log_level=args.l,
         seed=args.s,
+        backend=args.b,
+        tail_approximation=args.tail_approximation,
+        max_seconds=args.max_seconds,
     )
     print(result)
+    if result.plan is not None:
+        print(result.plan)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,202 @@
+"""
+Module: server
+
+Implements:
+ - Long-running randtest server with a warm worker pool
+ - Client of the randtest server
+
+The server listens on a local Unix socket for test requests in the JSON
+lines format: the client writes one JSON object per line, and the server
+answers each line with one JSON object. A request names the test, its two
+data sets (inline or as file names to be read by the server), and the
+arguments of the test, e.g.,
+
+    {"test": "randtest", "data": [[5, 6], [8, 10]], "num_permutations": -1}
+    {"test": "randtest", "files": ["/data/a.dat", "/data/b.dat"],
+     "mct": "trimmed_mean", "mct_params": {"trim_percent": 0.2}, "seed": 0}
+
+The measure of central tendency (and the test statistic) is the name of a
+registered statistic with optional parameters, see randtest.specs. The
+answer holds the attributes of the result object together with its
+printout `text`, or an `error` message.
+
+The worker processes are started once with the server, so a test request
+only pays for the computation itself. Each test is carried out by a single
+worker, i.e., the server runs up to `num_jobs` tests at a time.
+
+"""
+
+import os
+import json
+import socket
+import logging
+import socketserver
+import multiprocessing as mp
+from .base import randtest, get_num_jobs
+from .paired import randtest_paired
+from .correlation import randtest_corr
+from .specs import StatisticSpec
+from .argparser_bp import read_data
+
+# Tests available on the server: function and accepted arguments
+TESTS = {
+    "randtest": (
+        randtest,
+        (
+            "mct",
+            "tstat",
+            "num_permutations",
+            "alternative",
+            "seed",
+            "tail_approximation",
+            "max_seconds",
+            "sampling",
+        ),
+    ),
+    "paired": (
+        randtest_paired,
+        ("mct", "num_permutations", "alternative", "seed"),
+    ),
+    "corr": (randtest_corr, ("num_permutations", "alternative", "seed")),
+}
+
+# Statistics given by name and parameters
+STATISTIC_ARGUMENTS = ("mct", "tstat")
+
+
+class RandTestServer(
+    socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    """
+    RandTestServer class
+
+    Serves each connection on a thread, which hands the test requests over
+    to the worker pool `pool`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path, pool):
+        super().__init__(path, RequestHandler)
+        self.pool = pool
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Answer the test requests of a connection, one per line"""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as error:
+                response = {"error": "invalid JSON: {}".format(error)}
+            else:
+                response = self.server.pool.apply(run_request, (request,))
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+def run_request(request) -> dict:
+    """
+    Carry out a test request in the calling process and return the answer:
+    the attributes of the result object and its printout `text`, or an
+    `error` message.
+    """
+    try:
+        assert isinstance(request, dict), "request must be a JSON object"
+        request = dict(request)
+        name = request.pop("test", "randtest")
+        assert name in TESTS, "unknown test '{}'".format(name)
+        func, arguments = TESTS[name]
+        if "files" in request:
+            data = [
+                tuple(read_data(ifname)) for ifname in request.pop("files")
+            ]
+        else:
+            data = [tuple(values) for values in request.pop("data")]
+        assert len(data) == 2, "two data sets required"
+        for key in STATISTIC_ARGUMENTS:
+            if key in request:
+                params = request.pop(key + "_params", {})
+                request[key] = StatisticSpec(request[key], **params)
+        unknown = set(request) - set(arguments)
+        assert not unknown, "unknown arguments {}".format(sorted(unknown))
+        logging.info("Request: %s %s", name, request)
+        result = func(*data, num_jobs=1, backend="threads", **request)
+    except Exception as error:
+        # Report any failure to the client instead of the server log
+        message = type(error).__name__
+        if str(error):
+            message += ": {}".format(error)
+        return {"error": message}
+    return result_to_dict(result)
+
+
+def result_to_dict(result) -> dict:
+    """
+    Turn the (scalar) attributes of a result object into a dictionary,
+    together with its printout `text` (followed by its plan, if any)
+    """
+    response = {}
+    for name in dir(type(result)):
+        if isinstance(getattr(type(result), name), property):
+            value = getattr(result, name)
+            if value is None or isinstance(value, (bool, int, float, str)):
+                response[name] = value
+    response["text"] = str(result)
+    if getattr(result, "plan", None) is not None:
+        response["text"] += "\n{}".format(result.plan)
+    return response
+
+
+def serve(path, num_jobs=1):
+    """
+    Start the worker pool and serve test requests on the Unix socket `path`
+    until interrupted. A stale socket file left behind by a previous server
+    is replaced.
+    """
+    if os.path.exists(path):
+        assert not is_listening(path), "### error: '{}' is in use.".format(
+            path
+        )
+        os.unlink(path)
+    n_jobs = get_num_jobs(num_jobs)
+    with mp.Pool(n_jobs) as pool:
+        server = RandTestServer(path, pool)
+        logging.info("Serving on '%s' with %d jobs", path, n_jobs)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            os.unlink(path)
+
+
+def is_listening(path) -> bool:
+    """Check whether a server listens on the Unix socket `path`"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def request_test(path, request) -> dict:
+    """
+    Send a test request to the randtest server listening on the Unix socket
+    `path` and return its answer, see the module docstring.
+    Raises RuntimeError if the server could not carry out the test.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        with sock.makefile("rwb") as fobj:
+            fobj.write(json.dumps(request).encode() + b"\n")
+            fobj.flush()
+            line = fobj.readline()
+    if not line:
+        raise RuntimeError("### error: no answer from '{}'.".format(path))
+    response = json.loads(line)
+    if "error" in response:
+        raise RuntimeError("### error: {}".format(response["error"]))
+    return response
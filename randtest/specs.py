@@ -0,0 +1,108 @@
+"""
+Module: specs
+
+Implements:
+ - Registry of named statistics with declared capabilities
+ - Statistic specifications (name plus parameters)
+
+A specification only holds the name of a registered statistic and its
+parameters, so it is cheap to pickle and works with any start method of
+the worker processes, in contrast to lambdas and closures. The declared
+capabilities let the engine pick fast paths:
+
+ - SUM_BASED: the measure of central tendency is the arithmetic mean, i.e.,
+   the test statistic only depends on the sum of each group, which enables
+   the block evaluations based on (partial) sums.
+ - ANTISYMMETRIC: swapping the groups negates the test statistic value.
+
+Plain functions keep working; they declare capabilities as attributes,
+e.g., `tstat.antisymmetric = True`.
+
+"""
+
+from statistics import median
+from .mcts import arithmetic_mean, trimmed_mean
+
+SUM_BASED = "sum_based"
+ANTISYMMETRIC = "antisymmetric"
+
+# Maps the name of a statistic to (function, capabilities)
+STATISTICS = {}
+
+
+def register_statistic(name, func, capabilities=()):
+    """
+    Register the statistic `func` under `name` with the given capabilities.
+    Register at module level, such that the registry is also populated in
+    worker processes that are started with 'spawn' or 'forkserver'.
+    """
+    assert isinstance(name, str) and callable(func)
+    assert all(c in (SUM_BASED, ANTISYMMETRIC) for c in capabilities)
+    STATISTICS[name] = (func, frozenset(capabilities))
+
+
+class StatisticSpec:
+    """
+    StatisticSpec class
+
+    Specification of a registered statistic with its parameters, e.g.,
+    `StatisticSpec("trimmed_mean", trim_percent=0.1)`. A specification is
+    called like the statistic itself.
+    """
+
+    def __init__(self, name, **params):
+        assert name in STATISTICS, "### error: unknown statistic '{}'.".format(
+            name
+        )
+        self.name = name
+        self.params = params
+
+    @property
+    def capabilities(self) -> frozenset:
+        """Getter: capabilities"""
+        return STATISTICS[self.name][1]
+
+    @property
+    def function(self):
+        """Getter: function"""
+        return STATISTICS[self.name][0]
+
+    def __call__(self, *args):
+        return self.function(*args, **self.params)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, StatisticSpec)
+            and self.name == other.name
+            and self.params == other.params
+        )
+
+    def __hash__(self):
+        return hash((self.name, tuple(sorted(self.params.items()))))
+
+    def __repr__(self):
+        params = "".join(
+            ", {}={!r}".format(key, value)
+            for key, value in sorted(self.params.items())
+        )
+        return "StatisticSpec({!r}{})".format(self.name, params)
+
+
+def get_statistic(statistic):
+    """Turn the name of a registered statistic into its specification"""
+    if isinstance(statistic, str):
+        return StatisticSpec(statistic)
+    assert callable(statistic)
+    return statistic
+
+
+def has_capability(statistic, capability) -> bool:
+    """Check whether a statistic (spec or function) declares a capability"""
+    if isinstance(statistic, StatisticSpec):
+        return capability in statistic.capabilities
+    return getattr(statistic, capability, False) is True
+
+
+register_statistic("mean", arithmetic_mean, (SUM_BASED,))
+register_statistic("trimmed_mean", trimmed_mean)
+register_statistic("median", median)
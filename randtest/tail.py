@@ -0,0 +1,133 @@
+"""
+Module: tail
+
+Implements:
+ - Approximation of small Monte Carlo p values by fitting a generalized
+   Pareto distribution (GPD) to the tail of the permutation distribution
+
+Based on:
+
+T. A. Knijnenburg, L. F. A. Wessels, M. J. T. Reinders, and I. Shmulevich,
+    "Fewer permutations, more accurate P-values,"
+    Bioinformatics, vol. 25, no. 12, pp. i161-i168, 2009.
+
+J. R. M. Hosking and J. R. Wallis, "Parameter and quantile estimation for
+    the generalized Pareto distribution,"
+    Technometrics, vol. 29, no. 3, pp. 339-349, 1987.
+
+"""
+
+import math
+from statistics import stdev
+
+# Number of exceedances from which on the empirical p value is used
+MIN_EXCEEDANCES = 10
+
+# Number of largest test statistic values used for the tail fit
+TAIL_SIZE = 250
+
+# Number of bootstrap samples for the standard error of the approximation
+NUM_BOOTSTRAP = 200
+
+
+def orient(tval, alternative) -> float:
+    """
+    Orient a test statistic value such that larger values are more extreme
+    according to the `alternative`.
+    """
+    if alternative == "two_sided":
+        return abs(tval)
+    if alternative == "greater":
+        return tval
+    return -tval
+
+
+def fit_gpd(exceedances) -> tuple:
+    """
+    Fit a GPD to the exceedances over a threshold with the method of
+    probability-weighted moments. Returns (shape k, scale sigma) in the
+    parameterization of Hosking and Wallis, i.e., the survival function is
+    (1 - k * y / sigma)^(1 / k).
+    """
+    values = sorted(exceedances)
+    num_values = len(values)
+    a_0 = math.fsum(values) / num_values
+    a_1 = (
+        math.fsum(
+            (1 - (i + 0.65) / num_values) * y for i, y in enumerate(values)
+        )
+        / num_values
+    )
+    denominator = a_0 - 2 * a_1
+    if denominator <= 0:
+        # Degenerate fit: all exceedances are equal
+        return 0.0, max(a_0, 1e-300)
+    shape = a_0 / denominator - 2
+    scale = 2 * a_0 * a_1 / denominator
+    return shape, scale
+
+
+def gpd_survival(y, shape, scale) -> float:
+    """Survival function of the GPD at y >= 0"""
+    if abs(shape) < 1e-12:
+        return math.exp(-y / scale)
+    base = 1 - shape * y / scale
+    if base <= 0:
+        # Beyond the upper endpoint of the fitted distribution
+        return 0.0
+    return base ** (1 / shape)
+
+
+def tail_p_value(tobs, tail, num_draws, rng) -> tuple:
+    """
+    Approximate the p value of the (oriented) observed test statistic value
+    `tobs` from the largest oriented test statistic values `tail` of
+    `num_draws` random data permutations. The threshold is the smallest
+    value in `tail` and the remaining values are its exceedances.
+
+    Returns the approximated p value and its bootstrap standard error.
+    """
+    values = sorted(tail, reverse=True)
+    threshold = values[-1]
+    exceedances = [value - threshold for value in values[:-1]]
+    num_exceedances = len(exceedances)
+    tail_probability = num_exceedances / num_draws
+
+    shape, scale = fit_gpd(exceedances)
+    p_value = tail_probability * gpd_survival(tobs - threshold, shape, scale)
+
+    bootstrap_p_values = []
+    for _ in range(NUM_BOOTSTRAP):
+        resample = [rng.choice(exceedances) for _ in range(num_exceedances)]
+        shape, scale = fit_gpd(resample)
+        bootstrap_p_values.append(
+            tail_probability * gpd_survival(tobs - threshold, shape, scale)
+        )
+    return p_value, stdev(bootstrap_p_values)
+
+
+def approximate_p_value(rtest) -> tuple:
+    """
+    Approximate the p value of a finished RandTest run with the tail
+    approximation. Falls back to the empirical p value (with its binomial
+    standard error) if there are enough exceedances, if the test is
+    systematic, or if the observed value does not exceed the threshold.
+    """
+    p_value = rtest.num_successes / rtest.num_permutations
+    if rtest.method == "Systematic":
+        return p_value, 0.0
+    # Valid Monte Carlo Randomization Test includes observed tobs
+    num_draws = rtest.num_permutations - 1
+    num_exceedances = rtest.num_successes - 1
+    tobs = orient(rtest.tobs, rtest.alternative)
+    if (
+        num_exceedances >= MIN_EXCEEDANCES
+        or len(rtest.tail) < MIN_EXCEEDANCES
+        or tobs <= min(rtest.tail)
+    ):
+        standard_error = math.sqrt(
+            p_value * (1 - p_value) / rtest.num_permutations
+        )
+        return p_value, standard_error
+    return tail_p_value(tobs, rtest.tail, num_draws, rtest.rng)
+
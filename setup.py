@@ -31,6 +31,9 @@ setup(
         "console_scripts": [
             "randtest-mean = randtest.randtest_mean:main",
             "randtest-tmean = randtest.randtest_tmean:main",
+            "randtest-paired = randtest.randtest_paired:main",
+            "randtest-corr = randtest.randtest_corr:main",
+            "randtest-serve = randtest.randtest_serve:main",
         ]
     },
     classifiers=[
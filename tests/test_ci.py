@@ -0,0 +1,96 @@
+"""
+Unit tests for randtest_ci
+"""
+
+import unittest
+from randtest import randtest, randtest_ci
+from randtest.mcts import trimmed_mean
+
+
+class TestRandTestCI(unittest.TestCase):
+    """Unittesting randtest_ci()"""
+
+    def test_randtest_ci_systematic(self):
+        """Simple functionality test: systematic"""
+        test_result = randtest_ci(
+            (5, 6, 7), (8, 10, 12, 9), num_permutations=-1
+        )
+        self.assertEqual(-3.75, test_result.estimate)
+        self.assertAlmostEqual(-9, test_result.lower, places=6)
+        self.assertAlmostEqual(1 / 3, test_result.upper, places=6)
+        self.assertEqual(35, test_result.num_permutations)
+
+    def test_randtest_ci_large_offset(self):
+        """Same interval for data with a large offset"""
+        offset = 10 ** 9
+        test_result = randtest_ci(
+            tuple(offset + x for x in (5, 6, 7)),
+            tuple(offset + x for x in (8, 10, 12, 9)),
+            num_permutations=-1,
+        )
+        self.assertEqual(-3.75, test_result.estimate)
+        self.assertAlmostEqual(-9, test_result.lower, places=6)
+        self.assertAlmostEqual(1 / 3, test_result.upper, places=6)
+
+    def test_randtest_ci_inverts_randtest(self):
+        """Endpoints separate accepted from rejected shifts"""
+        group_a = (101, 100, 102, 104, 102, 97, 105, 105, 98, 101, 100, 123)
+        group_b = (99, 101, 100, 101, 102, 100, 97, 101, 104, 101, 102)
+        test_result = randtest_ci(
+            group_a,
+            group_b,
+            confidence_level=0.9,
+            num_permutations=500,
+            num_jobs=-1,
+            seed=0,
+        )
+        self.assertLess(test_result.lower, test_result.estimate)
+        self.assertGreater(test_result.upper, test_result.estimate)
+        for endpoint, direction in (
+            (test_result.lower, -1),
+            (test_result.upper, 1),
+        ):
+            for shift, accepted in (
+                (-direction * 1e-4, True),
+                (direction * 1e-4, False),
+            ):
+                # Same seed, same data permutations
+                shift_result = randtest(
+                    tuple(x - endpoint - shift for x in group_a),
+                    group_b,
+                    num_permutations=500,
+                    seed=0,
+                )
+                self.assertEqual(accepted, shift_result.p_value > 0.1)
+
+    def test_randtest_ci_mct_func(self):
+        """Supplied mct: same data permutations for all shifts"""
+        group_a = (101, 100, 102, 104, 102, 97, 105, 105, 98, 101, 100, 123)
+        group_b = (99, 101, 100, 101, 102, 100, 97, 101, 104, 101, 102)
+        test_result = randtest_ci(
+            group_a, group_b, mct=trimmed_mean, num_permutations=200, seed=0
+        )
+        self.assertLess(test_result.lower, test_result.estimate)
+        self.assertGreater(test_result.upper, test_result.estimate)
+        self.assertEqual(200, test_result.num_permutations)
+        # Endpoints to a fraction of the resolution of the data
+        for endpoint, direction in (
+            (test_result.lower, -1),
+            (test_result.upper, 1),
+        ):
+            for shift, accepted in (
+                (-direction * 2e-3, True),
+                (direction * 2e-3, False),
+            ):
+                shift_result = randtest(
+                    tuple(x - endpoint - shift for x in group_a),
+                    group_b,
+                    mct=trimmed_mean,
+                    num_permutations=200,
+                    seed=0,
+                )
+                self.assertEqual(accepted, shift_result.p_value > 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
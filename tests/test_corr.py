@@ -0,0 +1,83 @@
+"""
+Unit tests for randtest_corr
+"""
+
+import shlex
+import subprocess
+import unittest
+from randtest import randtest_corr
+
+
+class TestRandTestCorr(unittest.TestCase):
+    """Unittesting randtest_corr()"""
+
+    def test_randtest_corr_systematic(self):
+        """Systematic: all 7! data permutations"""
+        data_x = (1, 2, 3, 4, 5, 6, 7)
+        data_y = (2.1, 1.9, 3.5, 3.0, 4.8, 4.1, 6.0)
+        for alternative, num_successes in (
+            ("two_sided", 28),
+            ("greater", 14),
+            ("less", 5028),
+        ):
+            test_result = randtest_corr(
+                data_x, data_y, num_permutations=-1, alternative=alternative
+            )
+            self.assertEqual(num_successes, test_result.num_successes)
+            self.assertEqual(5040, test_result.num_permutations)
+            self.assertAlmostEqual(0.9136155796817, test_result.statistic)
+            self.assertAlmostEqual(0.6214285714286, test_result.slope)
+
+    def test_randtest_corr_near_tie(self):
+        """Systematic: nearly tied responses are not counted as ties"""
+        for delta, num_successes in ((0.0, 2), (1e-9, 1)):
+            test_result = randtest_corr(
+                (1, 2, 3, 4),
+                (0, 1, 2, 2 + delta),
+                num_permutations=-1,
+                alternative="greater",
+            )
+            self.assertEqual(num_successes, test_result.num_successes)
+
+    def test_randtest_corr_monte_carlo(self):
+        """Monte Carlo: reproducible across jobs and backends"""
+        data_x = (0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0, 5.5, 6.0)
+        data_y = (3.1, 2.4, 3.9, 3.2, 4.4, 3.8, 5.1, 4.0, 4.9, 5.8, 4.7, 6.2)
+        results = [
+            randtest_corr(
+                data_x,
+                data_y,
+                num_permutations=2000,
+                num_jobs=num_jobs,
+                seed=0,
+                backend=backend,
+            )
+            for num_jobs, backend in ((1, "processes"), (-1, "threads"))
+        ]
+        self.assertEqual(results[0].num_successes, results[1].num_successes)
+        self.assertEqual(2000, results[0].num_permutations)
+        self.assertLess(results[0].p_value, 0.01)
+
+    def test_randtest_corr_cli(self):
+        """Test CLI: randtest-corr"""
+        cmd = (
+            "randtest-corr -p -1 -a greater "
+            + "../data/group_A.dat ../data/group_B.dat"
+        )
+        result = subprocess.run(shlex.split(cmd), stdout=subprocess.PIPE)
+        excepted_output = (
+            "<class 'randtest.correlation.RandTestCorrResult'>\n"
+            + "Method = Systematic\n"
+            + "Alternative = greater\n"
+            + "Observed correlation coefficient = 1\n"
+            + "Slope = 2\n"
+            + "Number of successes = 1\n"
+            + "Number of permutations = 2\n"
+            + "p value = 0.5\n"
+            + "seed = None\n"
+        )
+        self.assertEqual(excepted_output, result.stdout.decode("ascii"))
+
+
+if __name__ == "__main__":
+    unittest.main()
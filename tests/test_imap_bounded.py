@@ -0,0 +1,84 @@
+"""
+Unit tests for the bounded submission of tasks to the worker pool
+"""
+
+import resource
+import unittest
+import multiprocessing as mp
+from multiprocessing.pool import ThreadPool
+from statistics import mean
+from randtest.base import RandTest, imap_bounded, test_statistic
+
+
+class TestImapBounded(unittest.TestCase):
+    """Unittesting imap_bounded()"""
+
+    def test_imap_bounded_results(self):
+        """All tasks are processed exactly once"""
+        with mp.Pool(2) as pool:
+            results = imap_bounded(pool, square, range(100), 3)
+            self.assertEqual(
+                sorted(i * i for i in range(100)), sorted(results)
+            )
+
+    def test_imap_bounded_outstanding_tasks(self):
+        """Tasks are only drawn from the iterable as results come back"""
+        drawn = []
+
+        def tasks():
+            for i in range(10 ** 9):
+                drawn.append(i)
+                yield i
+
+        with mp.Pool(2) as pool:
+            for num_results, _ in enumerate(
+                imap_bounded(pool, square, tasks(), 4), start=1
+            ):
+                self.assertLessEqual(len(drawn), num_results + 4)
+                if num_results == 200:
+                    break
+
+    def test_imap_bounded_error(self):
+        """Errors in a worker are raised in the parent"""
+        with mp.Pool(2) as pool:
+            with self.assertRaises(ZeroDivisionError):
+                list(imap_bounded(pool, inverse, range(-5, 5), 2))
+
+    def test_systematic_enumeration_memory(self):
+        """Peak RSS stays flat on the C(40, 20) enumeration"""
+        group_a = tuple(range(20))
+        group_b = tuple(range(20, 40))
+        rtest = RandTest(
+            group_a, group_b, mean, test_statistic, -1, "two_sided", 2, None
+        )
+        for pool_class in (mp.Pool, ThreadPool):
+            max_rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            with pool_class(rtest.njobs) as pool:
+                for num_blocks, _ in enumerate(
+                    imap_bounded(
+                        pool,
+                        rtest.compute_block,
+                        rtest._get_systematic_blocks(),
+                        8,
+                    ),
+                    start=1,
+                ):
+                    if num_blocks == 500:
+                        break
+            max_rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # ru_maxrss is given in kilobytes on Linux
+            self.assertLess(max_rss_after - max_rss_before, 50 * 1024)
+
+
+def square(value):
+    """Test function: square"""
+    return value * value
+
+
+def inverse(value):
+    """Test function: inverse"""
+    return 1 / value
+
+
+if __name__ == "__main__":
+    unittest.main()
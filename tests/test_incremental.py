@@ -0,0 +1,84 @@
+"""
+Unit tests for IncrementalRandTest
+"""
+
+import pickle
+import unittest
+from randtest import randtest, IncrementalRandTest
+
+
+class TestIncrementalRandTest(unittest.TestCase):
+    """Unittesting IncrementalRandTest"""
+
+    def test_incremental_single_batch(self):
+        """One batch: Monte Carlo approximation of randtest()"""
+        rtest = IncrementalRandTest(num_permutations=20000, seed=0)
+        rtest.append("A", (5, 6, 7, 3))
+        rtest.append("B", (8, 10, 9))
+        test_result = rtest.update()
+        exact_result = randtest((5, 6, 7, 3), (8, 10, 9), num_permutations=-1)
+        self.assertEqual(exact_result.statistic, test_result.statistic)
+        self.assertEqual(20000, test_result.num_permutations)
+        self.assertAlmostEqual(
+            exact_result.p_value, test_result.p_value, delta=0.01
+        )
+
+    def test_incremental_large_offset(self):
+        """Same result for data with a large offset (exact in floats)"""
+        results = []
+        for offset in (0.0, 1e9):
+            rtest = IncrementalRandTest(num_permutations=2000, seed=0)
+            rtest.append("A", tuple(offset + x for x in (0.5, 1.5, 2.0, 5.5)))
+            rtest.append("B", tuple(offset + x for x in (3.5, 4.5, 5.5, 7.5)))
+            results.append(rtest.update())
+        self.assertEqual(results[0].num_successes, results[1].num_successes)
+        self.assertLess(results[1].p_value, 0.2)
+
+    def test_incremental_empty_group(self):
+        """Failed update: state unchanged, pending batch kept"""
+        rtest = IncrementalRandTest(num_permutations=20000, seed=0)
+        rtest.append("A", (5, 6, 7, 3))
+        with self.assertRaises(AssertionError):
+            rtest.update()
+        self.assertEqual(0, rtest.num_batches)
+        rtest.append("B", (8, 10, 9))
+        test_result = rtest.update()
+        expected = IncrementalRandTest(num_permutations=20000, seed=0)
+        expected.append("A", (5, 6, 7, 3))
+        expected.append("B", (8, 10, 9))
+        expected_result = expected.update()
+        self.assertEqual(
+            expected_result.num_successes, test_result.num_successes
+        )
+        self.assertEqual(expected_result.statistic, test_result.statistic)
+
+    def test_incremental_batches_stratified(self):
+        """Several batches: approximation of the stratified randtest()"""
+        rtest = IncrementalRandTest(
+            num_permutations=20000, alternative="less", seed=1
+        )
+        rtest.append("A", (5, 6, 7, 3))
+        rtest.append("B", (8, 10, 9))
+        rtest.update()
+        # Persisted state is extended by the next batch
+        rtest = pickle.loads(pickle.dumps(rtest))
+        rtest.append("A", (7, 4))
+        rtest.append("B", (9, 11, 12))
+        test_result = rtest.update()
+        exact_result = randtest(
+            (5, 6, 7, 3, 7, 4),
+            (8, 10, 9, 9, 11, 12),
+            num_permutations=-1,
+            alternative="less",
+            strata=((0, 0, 0, 0, 1, 1), (0, 0, 0, 1, 1, 1)),
+        )
+        self.assertEqual(exact_result.statistic, test_result.statistic)
+        self.assertEqual(exact_result.mcta, test_result.mcta)
+        self.assertEqual(exact_result.mctb, test_result.mctb)
+        self.assertAlmostEqual(
+            exact_result.p_value, test_result.p_value, delta=0.005
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
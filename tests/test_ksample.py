@@ -0,0 +1,109 @@
+"""
+Unit tests for randtest_ksample
+"""
+
+import unittest
+from itertools import permutations
+from randtest import randtest, randtest_ksample
+
+
+class TestRandTestKSample(unittest.TestCase):
+    """Unittesting randtest_ksample()"""
+
+    def test_randtest_ksample_systematic(self):
+        """Simple functionality test: systematic F test"""
+        test_result = randtest_ksample(
+            [(1, 2, 3), (2, 5), (7, 8, 6)], num_permutations=-1
+        )
+        self.assertAlmostEqual(11.470588, test_result.statistic, places=5)
+        self.assertEqual(12, test_result.num_successes)
+        self.assertEqual(560, test_result.num_permutations)
+        self.assertIsNone(test_result.pairwise)
+
+    def test_randtest_ksample_systematic_four_groups(self):
+        """Systematic F test: same result as enumerating all orderings"""
+        groups = [(1, 2), (2, 5, 4), (7,), (3, 9)]
+        data = tuple(x for group in groups for x in group)
+        bounds = ((0, 2), (2, 5), (5, 6), (6, 8))
+
+        def between_group_term(order):
+            return sum(
+                sum(data[i] for i in order[start:end]) ** 2 / (end - start)
+                for start, end in bounds
+            )
+
+        # Distinct assignments of the indices to the groups
+        assignments = {
+            tuple(frozenset(order[start:end]) for start, end in bounds): order
+            for order in permutations(range(len(data)))
+        }
+        observed = between_group_term(tuple(range(len(data))))
+        num_successes = sum(
+            between_group_term(order) >= observed - 1e-9
+            for order in assignments.values()
+        )
+        test_result = randtest_ksample(groups, num_permutations=-1)
+        self.assertEqual(len(assignments), test_result.num_permutations)
+        self.assertEqual(num_successes, test_result.num_successes)
+
+    def test_randtest_ksample_two_groups(self):
+        """With two groups, the F test equals the two-sided mean test"""
+        ksample_result = randtest_ksample(
+            [(5, 6), (8, 10)], num_permutations=-1
+        )
+        twosample_result = randtest((5, 6), (8, 10), num_permutations=-1)
+        self.assertEqual(
+            twosample_result.num_successes, ksample_result.num_successes
+        )
+        self.assertEqual(
+            twosample_result.num_permutations, ksample_result.num_permutations
+        )
+
+    def test_randtest_ksample_large_offset(self):
+        """Same result for data with a large offset"""
+        groups = [(0.1, 1.3, 2.2), (5.1, 3.5, 4.4), (5.6, 7.7, 0.4)]
+        results = [
+            randtest_ksample(
+                [tuple(offset + x for x in group) for group in groups],
+                num_permutations=-1,
+            )
+            for offset in (0, 1e9)
+        ]
+        self.assertEqual(372, results[0].num_successes)
+        self.assertEqual(372, results[1].num_successes)
+        self.assertAlmostEqual(results[0].statistic, results[1].statistic)
+
+    def test_randtest_ksample_pairwise(self):
+        """Pairwise follow-ups share the data permutations of the F test"""
+        test_result = randtest_ksample(
+            [(1, 2, 3), (2, 5), (7, 8, 6)],
+            num_permutations=2000,
+            pairwise=True,
+            num_jobs=-1,
+            seed=0,
+        )
+        self.assertEqual(
+            [(0, 1), (0, 2), (1, 2)], sorted(test_result.pairwise)
+        )
+        pair_result = test_result.pairwise[(0, 2)]
+        self.assertEqual(2, pair_result.mcta)
+        self.assertEqual(7, pair_result.mctb)
+        self.assertEqual(-5, pair_result.statistic)
+        self.assertEqual(2000, pair_result.num_permutations)
+        self.assertLess(
+            pair_result.p_value, test_result.pairwise[(0, 1)].p_value
+        )
+
+    def test_randtest_ksample_monte_carlo_seed(self):
+        """Monte Carlo: same seed, same result irrespective of num_jobs"""
+        groups = [(1, 2, 3, 4), (2, 5, 4), (7, 8, 6), (3, 3, 9)]
+        result_1 = randtest_ksample(groups, num_permutations=3000, seed=1)
+        result_2 = randtest_ksample(
+            groups, num_permutations=3000, num_jobs=-1, seed=1
+        )
+        self.assertEqual(result_1.num_successes, result_2.num_successes)
+        self.assertEqual(3000, result_1.num_permutations)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Unit tests for randtest_paired
+"""
+
+import shlex
+import subprocess
+import unittest
+from types import GeneratorType
+from randtest import randtest_paired
+from randtest.mcts import arithmetic_mean
+
+
+class TestRandTestPaired(unittest.TestCase):
+    """Unittesting randtest_paired()"""
+
+    def test_randtest_paired_systematic_twosided(self):
+        """Simple functionality test: systematic, two_sided"""
+        test_result = randtest_paired(
+            (5, 6, 7), (4, 6, 5), num_permutations=-1, alternative="two_sided",
+        )
+        self.assertEqual(4, test_result.num_successes)
+        self.assertEqual(8, test_result.num_permutations)
+
+    def test_randtest_paired_systematic_greater(self):
+        """Simple functionality test: systematic, greater"""
+        test_result = randtest_paired(
+            (5, 6, 7), (4, 6, 5), num_permutations=-1, alternative="greater",
+        )
+        self.assertEqual(2, test_result.num_successes)
+        self.assertEqual(8, test_result.num_permutations)
+
+    def test_randtest_paired_systematic_less(self):
+        """Simple functionality test: systematic, less"""
+        test_result = randtest_paired(
+            (5, 6, 7), (4, 6, 5), num_permutations=-1, alternative="less",
+        )
+        self.assertEqual(8, test_result.num_successes)
+        self.assertEqual(8, test_result.num_permutations)
+
+    def test_randtest_paired_systematic_mct_func(self):
+        """Gray-code sums agree with the generic MCT computation"""
+        group_a = (51, 63, 72, 44, 88, 33, 91, 22, 66, 77, 11)
+        group_b = (40, 60, 61, 50, 70, 31, 80, 25, 60, 70, 10)
+        for alternative in ("two_sided", "greater", "less"):
+            fast_result = randtest_paired(
+                group_a,
+                group_b,
+                num_permutations=-1,
+                alternative=alternative,
+                num_jobs=-1,
+            )
+            slow_result = randtest_paired(
+                group_a,
+                group_b,
+                mct=mct_func_mean,
+                num_permutations=-1,
+                alternative=alternative,
+                num_jobs=-1,
+            )
+            self.assertEqual(
+                slow_result.num_successes, fast_result.num_successes
+            )
+            self.assertEqual(2 ** 11, fast_result.num_permutations)
+
+    def test_randtest_paired_systematic_large_differences(self):
+        """Sum-based path: no spurious ties for large differences"""
+        offset = 1e9
+        group_a = (offset + 0.1, 0, offset + 2.2, 0, offset + 0.7, 0)
+        group_b = (0, offset + 1.3, 0, offset + 5.1, 0, offset + 3.3)
+        for mct in (arithmetic_mean, mct_func_mean):
+            test_result = randtest_paired(
+                group_a, group_b, mct=mct, num_permutations=-1
+            )
+            self.assertEqual(48, test_result.num_successes)
+            self.assertEqual(64, test_result.num_permutations)
+
+    def test_randtest_paired_monte_carlo(self):
+        """Monte Carlo: reproducible and agrees with the generic MCT"""
+        group_a = (51, 63, 72, 44, 88, 33, 91, 22, 66, 77, 11)
+        group_b = (40, 60, 61, 50, 70, 31, 80, 25, 60, 70, 10)
+        fast_result = randtest_paired(
+            group_a, group_b, num_permutations=5000, num_jobs=-1, seed=0
+        )
+        slow_result = randtest_paired(
+            group_a, group_b, mct=mct_func_mean, num_permutations=5000, seed=0
+        )
+        self.assertEqual(slow_result.num_successes, fast_result.num_successes)
+        self.assertEqual(5000, fast_result.num_permutations)
+
+    def test_randtest_paired_cli(self):
+        """Test CLI: randtest-paired"""
+        cmd = "randtest-paired -p -1 ../data/group_A.dat ../data/group_B.dat"
+        result = subprocess.run(shlex.split(cmd), stdout=subprocess.PIPE)
+        excepted_output = (
+            "<class 'randtest.base.RandTestResult'>\n"
+            + "Method = Systematic\n"
+            + "Alternative = two_sided\n"
+            + "MCT(data of group A) = 5.5\n"
+            + "MCT(data of group B) = 9\n"
+            + "Observed test statistic value = -3.5\n"
+            + "Number of successes = 2\n"
+            + "Number of permutations = 4\n"
+            + "p value = 0.5\n"
+            + "seed = None\n"
+        )
+        self.assertEqual(excepted_output, result.stdout.decode("ascii"))
+
+
+def mct_func_mean(data: GeneratorType) -> float:
+    """MCT test function: mean (bypasses the sum-based computation)"""
+    return arithmetic_mean(data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Unit tests for the planning of a randomization test
+"""
+
+import time
+import unittest
+from statistics import mean
+from randtest import randtest, plan_randtest
+from randtest.planner import plan, MIN_PERMUTATIONS, MAX_PERMUTATIONS
+
+
+class TestPlanner(unittest.TestCase):
+    """Unittesting randtest(..., max_seconds=...) and plan_randtest()"""
+
+    def test_plan_small_sample_systematic(self):
+        """Few data permutations: the systematic approach is chosen"""
+        test_plan = plan_randtest((5, 6), (8, 10), max_seconds=1)
+        self.assertEqual("Systematic", test_plan.method)
+        self.assertEqual(-1, test_plan.num_permutations)
+        self.assertEqual(6, test_plan.num_total)
+        self.assertEqual(1, test_plan.num_jobs)
+
+    def test_plan_large_sample_monte_carlo(self):
+        """Too many data permutations: the Monte Carlo approach is chosen"""
+        group_a = tuple(range(40))
+        group_b = tuple(range(5, 45))
+        test_plan = plan_randtest(group_a, group_b, max_seconds=0.5)
+        self.assertEqual("Monte Carlo", test_plan.method)
+        self.assertGreaterEqual(test_plan.num_permutations, MIN_PERMUTATIONS)
+        self.assertLessEqual(test_plan.num_permutations, MAX_PERMUTATIONS)
+        self.assertEqual(107507208733336176461620, test_plan.num_total)
+
+    def test_plan_binary_systematic(self):
+        """Binary data: few compositions, the systematic approach is chosen"""
+        group_a = (1,) * 30 + (0,) * 70
+        group_b = (1,) * 25 + (0,) * 75
+        test_plan = plan_randtest(group_a, group_b, max_seconds=1)
+        self.assertEqual("Systematic", test_plan.method)
+        self.assertEqual(
+            90548514656103281165404177077484163874504589675413336841320,
+            test_plan.num_total,
+        )
+
+    def test_plan_budget(self):
+        """Method, permutations, jobs and block size from the calibration"""
+
+        def evaluate(size):
+            """Calibration stub: 10 microseconds per data permutation"""
+            time.sleep(size * 1e-5)
+
+        test_plan = plan(evaluate, 10 ** 12, 10000, 10.0, 4)
+        spp = test_plan.seconds_per_permutation
+        self.assertEqual("Monte Carlo", test_plan.method)
+        self.assertEqual(
+            min(MAX_PERMUTATIONS, int(10.0 * 4 / spp)),
+            test_plan.num_permutations,
+        )
+        test_plan = plan(evaluate, 500, 10000, 1e-9, 4)
+        self.assertEqual("Systematic", test_plan.method)
+        self.assertEqual(1, test_plan.num_jobs)
+        test_plan = plan(evaluate, 10 ** 12, 2000, None, 4)
+        self.assertEqual("Monte Carlo", test_plan.method)
+        self.assertEqual(2000, test_plan.num_permutations)
+        self.assertGreaterEqual(test_plan.block_size, 10)
+
+    def test_randtest_max_seconds(self):
+        """Planned systematic randomization test: exact p value"""
+        test_result = randtest(
+            (5, 6), (8, 10), mct=mean, max_seconds=1, seed=0
+        )
+        self.assertEqual("Systematic", test_result.method)
+        self.assertEqual(2, test_result.num_successes)
+        self.assertEqual(6, test_result.num_permutations)
+        self.assertEqual(-1, test_result.plan.num_permutations)
+
+    def test_randtest_without_plan(self):
+        """No time budget: no plan"""
+        test_result = randtest((5, 6), (8, 10), num_permutations=-1)
+        self.assertIsNone(test_result.plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Unit tests for randtest_power
+"""
+
+import unittest
+from randtest import randtest_power
+
+
+class TestRandTestPower(unittest.TestCase):
+    """Unittesting randtest_power()"""
+
+    def test_randtest_power_normal(self):
+        """Normal data, effect of one standard deviation, 20 vs 20 units"""
+        test_result = randtest_power(
+            20, 20, 1.0, num_simulations=400, num_permutations=500, seed=0
+        )
+        # Power of the two-sample t test: 0.87
+        self.assertAlmostEqual(0.87, test_result.power, delta=0.06)
+        self.assertEqual(400, test_result.num_simulations)
+        self.assertGreater(test_result.power_se, 0)
+
+    def test_randtest_power_type_one_error(self):
+        """No effect: the rejection rate is close to alpha"""
+        test_result = randtest_power(
+            10,
+            15,
+            0.0,
+            distribution=lambda rng: rng.expovariate(1.0),
+            num_simulations=400,
+            num_permutations=200,
+            seed=1,
+            backend="threads",
+        )
+        self.assertAlmostEqual(0.05, test_result.power, delta=0.035)
+
+    def test_randtest_power_reproducible(self):
+        """Results do not depend on the number of jobs and the backend"""
+        results = [
+            randtest_power(
+                8,
+                8,
+                0.5,
+                mct="median",
+                num_simulations=50,
+                num_permutations=100,
+                alternative="greater",
+                num_jobs=num_jobs,
+                seed=2,
+                backend=backend,
+            )
+            for num_jobs, backend in ((1, "processes"), (-1, "threads"))
+        ]
+        self.assertEqual(
+            results[0].num_rejections, results[1].num_rejections
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,10 +3,13 @@ Unit tests for randtest
 """
 
 import shlex
+import random
 import subprocess
 import unittest
 from types import GeneratorType
+from statistics import mean
 from randtest import randtest
+from randtest.base import RandTest, test_statistic, n_choose_k
 from randtest.mcts import (
     arithmetic_mean,
     trimmed_mean,
@@ -171,6 +174,271 @@ class TestRandTest(unittest.TestCase):
         self.assertEqual(6, test_result.num_successes)
         self.assertEqual(30, test_result.num_permutations)
 
+    def test_randtest_systematic_large_offset(self):
+        """Sum-based path: no spurious ties for data with a large offset"""
+        offset = 1e9
+        group_a = tuple(offset + x for x in (0.1, 1.3, 2.2, 5.1))
+        group_b = tuple(offset + x for x in (3.5, 4.4, 5.6, 7.7))
+        for tstat in (test_statistic, test_statistic_difference):
+            test_result = randtest(
+                group_a, group_b, tstat=tstat, num_permutations=-1
+            )
+            self.assertEqual(6, test_result.num_successes)
+            self.assertEqual(70, test_result.num_permutations)
+
+    def test_randtest_systematic_strata(self):
+        """Systematic: permute within strata only"""
+        test_result = randtest(
+            (5, 6, 1),
+            (8, 10, 2),
+            num_permutations=-1,
+            alternative="two_sided",
+            strata=(("x", "x", "y"), ("x", "x", "y")),
+        )
+        # 6 combinations within stratum x times 2 within stratum y
+        self.assertEqual(2, test_result.num_successes)
+        self.assertEqual(12, test_result.num_permutations)
+
+    def test_randtest_systematic_strata_mct_func(self):
+        """Systematic: partial sums of strata agree with supplied mct"""
+        group_a = (5, 6, 7, 4, 9, 3, 9)
+        group_b = (4, 6, 6, 5, 7, 3, 8, 2)
+        strata = ((0, 0, 1, 1, 2, 2, 2), (0, 0, 0, 1, 1, 2, 2, 2))
+        for alternative in ("two_sided", "greater", "less"):
+            fast_result = randtest(
+                group_a,
+                group_b,
+                num_permutations=-1,
+                alternative=alternative,
+                strata=strata,
+            )
+            slow_result = randtest(
+                group_a,
+                group_b,
+                mct=mct_func_mean,
+                num_permutations=-1,
+                alternative=alternative,
+                num_jobs=-1,
+                strata=strata,
+            )
+            self.assertEqual(
+                slow_result.num_successes, fast_result.num_successes
+            )
+            self.assertEqual(1200, fast_result.num_permutations)
+
+    def test_randtest_systematic_strata_decimal_ties(self):
+        """Systematic: no rounding drift along the strata for tied decimals"""
+        group_a = (0.2, 0.3, 0.7, 0.2, 1.1, 0.1, 1.1, 0.3, 1.1, 10.3)
+        group_b = (2.9, 0.2, 0.1, 1.1, 1.1, 2.9, 0.2, 0.3, 0.1, 1.1)
+        labels = (0,) * 5 + (1,) * 5
+        test_result = randtest(
+            group_a, group_b, num_permutations=-1, strata=(labels, labels)
+        )
+        # Enumeration of the decimal values with exact rational arithmetic
+        self.assertEqual(53594, test_result.num_successes)
+        self.assertEqual(63504, test_result.num_permutations)
+
+    def test_randtest_monte_strata(self):
+        """Monte Carlo: permute within strata only"""
+        test_result = randtest(
+            (5, 6, 1),
+            (8, 10, 2),
+            num_permutations=1000,
+            alternative="two_sided",
+            seed=0,
+            strata=(("x", "x", "y"), ("x", "x", "y")),
+        )
+        self.assertEqual(1000, test_result.num_permutations)
+        self.assertAlmostEqual(2 / 12, test_result.p_value, delta=0.05)
+
+    def test_randtest_monte_threads_smartdrug(self):
+        """Thread pool backend: same result as the process pool"""
+        with open("../data/smart_drug_data_treatment_group.dat", "r") as fobj:
+            group_a = tuple(int(val.strip()) for val in fobj.readlines())
+        with open("../data/smart_drug_data_placebo_group.dat", "r") as fobj:
+            group_b = tuple(int(val.strip()) for val in fobj.readlines())
+        for mct, num_successes in ((mct_func_mean, 128), (None, 128)):
+            kwargs = {} if mct is None else {"mct": mct}
+            test_result = randtest(
+                group_a,
+                group_b,
+                num_permutations=1000,
+                num_jobs=-1,
+                seed=0,
+                backend="threads",
+                **kwargs
+            )
+            self.assertEqual(num_successes, test_result.num_successes)
+            self.assertEqual(1000, test_result.num_permutations)
+
+    def test_randtest_systematic_complement_symmetry(self):
+        """Equal group sizes: same result as the full enumeration"""
+        group_a = (5.1, 6.3, 9.0, 3.2, 7.7, 2.5)
+        group_b = (8.4, 10.0, 4.6, 6.8, 9.9, 1.2)
+        for mct in (mct_func_mean, mct_func_trimmed_mean):
+            for alternative in ("two_sided", "greater", "less"):
+                results = [
+                    randtest(
+                        group_a,
+                        group_b,
+                        mct=mct,
+                        tstat=tstat,
+                        num_permutations=-1,
+                        alternative=alternative,
+                    )
+                    for tstat in (test_statistic, test_statistic_difference)
+                ]
+                self.assertEqual(
+                    results[1].num_successes, results[0].num_successes
+                )
+                self.assertEqual(924, results[0].num_permutations)
+        rtest = RandTest(
+            group_a, group_b, mean, test_statistic, -1, "two_sided", 1, None
+        )
+        self.assertTrue(rtest.symmetric)
+        self.assertEqual(
+            462, sum(len(block) for block in rtest._get_systematic_blocks())
+        )
+
+    def test_randtest_systematic_multiset(self):
+        """Tied data: same result as the full enumeration"""
+        group_a = (0, 1, 3, 1, 2, 2, 3)
+        group_b = (1, 0, 0, 2, 1, 4)
+        # A single stratum enumerates all data permutations
+        strata = ((0,) * len(group_a), (0,) * len(group_b))
+        for mct in (mean, mct_func_trimmed_mean):
+            for alternative in ("two_sided", "greater", "less"):
+                results = [
+                    randtest(
+                        group_a,
+                        group_b,
+                        mct=mct,
+                        num_permutations=-1,
+                        alternative=alternative,
+                        strata=labels,
+                    )
+                    for labels in (None, strata)
+                ]
+                self.assertEqual(
+                    results[1].num_successes, results[0].num_successes
+                )
+                self.assertEqual(1716, results[0].num_permutations)
+        rtest = RandTest(
+            group_a, group_b, mean, test_statistic, -1, "two_sided", 1, None
+        )
+        self.assertIsNotNone(rtest.multiset)
+        self.assertEqual(77, rtest.count_evaluations())
+
+    def test_randtest_systematic_multiset_unprofitable(self):
+        """A single tie: the symmetric enumeration of data permutations"""
+        group_a = tuple(range(10))
+        group_b = tuple(range(9, 19))
+        rtest = RandTest(
+            group_a, group_b, mean, test_statistic, -1, "two_sided", 1, None
+        )
+        self.assertIsNone(rtest.multiset)
+        self.assertTrue(rtest.symmetric)
+        self.assertEqual(92378, rtest.count_evaluations())
+
+    def test_randtest_systematic_multiset_binary(self):
+        """Binary data: hypergeometric p value (Fisher's exact test)"""
+        group_a = (1,) * 300 + (0,) * 700
+        group_b = (1,) * 250 + (0,) * 750
+        test_result = randtest(
+            group_a, group_b, num_permutations=-1, alternative="greater"
+        )
+        num_total = n_choose_k(2000, 1000)
+        num_successes = sum(
+            n_choose_k(550, k) * n_choose_k(1450, 1000 - k)
+            for k in range(300, 551)
+        )
+        self.assertEqual(num_total, test_result.num_permutations)
+        self.assertEqual(num_successes, test_result.num_successes)
+
+    def test_randtest_monte_stratified_exact(self):
+        """Stratified sampling: enumerated strata yield the exact p value"""
+        group_a = (5.1, 6.3, 9.0, 3.2, 7.7)
+        group_b = (8.4, 10.0, 4.6, 6.8, 9.9, 1.2)
+        for mct in (mean, mct_func_trimmed_mean):
+            for alternative in ("two_sided", "greater", "less"):
+                results = [
+                    randtest(
+                        group_a,
+                        group_b,
+                        mct=mct,
+                        num_permutations=num_permutations,
+                        alternative=alternative,
+                        seed=0,
+                        sampling=sampling,
+                    )
+                    for num_permutations, sampling in (
+                        (-1, "uniform"),
+                        (10000, "stratified"),
+                    )
+                ]
+                self.assertEqual(462, results[1].num_permutations)
+                self.assertEqual(
+                    results[0].num_successes, results[1].num_successes
+                )
+                self.assertAlmostEqual(results[0].p_value, results[1].p_value)
+                self.assertEqual(0.0, results[1].p_value_se)
+
+    def test_randtest_monte_stratified_unbiased(self):
+        """Stratified sampling: unbiased estimate of the exact p value"""
+        group_a = (5.1, 6.3, 9.0, 3.2, 7.7, 2.5, 11.3, 8.8)
+        group_b = (8.4, 10.0, 4.6, 6.8, 9.9, 1.2, 0.7, 3.9)
+        exact = randtest(group_a, group_b, num_permutations=-1).p_value
+        estimates, variances = [], []
+        for seed in range(200):
+            test_result = randtest(
+                group_a,
+                group_b,
+                num_permutations=200,
+                seed=seed,
+                backend="threads",
+                sampling="stratified",
+            )
+            self.assertEqual(200, test_result.num_permutations)
+            estimates.append(test_result.p_value)
+            variances.append(test_result.p_value_se ** 2)
+        # Mean of 200 independent estimates within 4 standard errors
+        self.assertAlmostEqual(
+            exact, mean(estimates), delta=4 * (mean(variances) / 200) ** 0.5
+        )
+        # Reported standard error not larger than the one of uniform
+        # sampling (up to 5 %): proportional allocation
+        self.assertLess(
+            mean(variances), 1.05 * exact * (1 - exact) / 200,
+        )
+
+    def test_randtest_monte_stratified_null(self):
+        """Stratified sampling: type I error rate under the null"""
+        num_rejections = [0, 0]
+        num_differences = 0
+        for seed in range(1000):
+            rng = random.Random(seed)
+            data = tuple(rng.gauss(0.0, 1.0) for _ in range(12))
+            rejected = [
+                randtest(
+                    data[:6],
+                    data[6:],
+                    num_permutations=num_permutations,
+                    seed=seed,
+                    backend="threads",
+                    sampling="stratified",
+                ).p_value
+                <= 0.1
+                for num_permutations in (-1, 200)
+            ]
+            num_rejections[0] += rejected[0]
+            num_rejections[1] += rejected[1]
+            num_differences += rejected[0] != rejected[1]
+        # Binomial(1000, 0.1): mean 100, standard deviation 9.5
+        for count in num_rejections:
+            self.assertAlmostEqual(100, count, delta=3 * 9.5)
+        # Estimates close to the exact p values: few decisions differ
+        self.assertLessEqual(num_differences, 30)
+
     def test_randtest_mean(self):
         """Test CLI: randtest-mean"""
         cmd = "randtest-mean -p -1 ../data/group_A.dat ../data/group_B.dat"
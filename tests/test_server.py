@@ -0,0 +1,134 @@
+"""
+Unit tests for the randtest server
+"""
+
+import os
+import time
+import shlex
+import tempfile
+import subprocess
+import unittest
+from randtest import randtest, randtest_paired, randtest_corr, StatisticSpec
+from randtest.server import request_test, run_request, is_listening
+
+
+class TestRandTestServer(unittest.TestCase):
+    """Unittesting randtest-serve and its clients"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.socket = os.path.join(cls.directory.name, "randtest.sock")
+        cls.server = subprocess.Popen(
+            shlex.split("randtest-serve -n 2 {}".format(cls.socket))
+        )
+        for _ in range(100):
+            if os.path.exists(cls.socket) and is_listening(cls.socket):
+                break
+            time.sleep(0.1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.terminate()
+        cls.server.wait()
+        cls.directory.cleanup()
+
+    def test_server_randtest(self):
+        """Same result as randtest() in the calling process"""
+        group_a = (5.1, 6.3, 9.0, 3.2, 7.7, 2.5)
+        group_b = (8.4, 10.0, 4.6, 6.8, 9.9, 1.2)
+        for mct in ("mean", "trimmed_mean"):
+            expected = randtest(
+                group_a,
+                group_b,
+                mct=StatisticSpec(mct),
+                num_permutations=500,
+                alternative="greater",
+                seed=0,
+            )
+            response = request_test(
+                self.socket,
+                {
+                    "data": [group_a, group_b],
+                    "mct": mct,
+                    "num_permutations": 500,
+                    "alternative": "greater",
+                    "seed": 0,
+                },
+            )
+            self.assertEqual(expected.num_successes, response["num_successes"])
+            self.assertEqual(500, response["num_permutations"])
+            self.assertEqual(expected.p_value, response["p_value"])
+            self.assertEqual(str(expected), response["text"])
+
+    def test_server_paired_corr(self):
+        """Paired test and test for association"""
+        data_x = (1, 2, 3, 4, 5, 6, 7)
+        data_y = (2.1, 1.9, 3.5, 3.0, 4.8, 4.1, 6.0)
+        for test, func in (
+            ("paired", randtest_paired),
+            ("corr", randtest_corr),
+        ):
+            expected = func(data_x, data_y, num_permutations=-1)
+            response = request_test(
+                self.socket,
+                {
+                    "test": test,
+                    "data": [data_x, data_y],
+                    "num_permutations": -1,
+                },
+            )
+            self.assertEqual(expected.num_successes, response["num_successes"])
+            self.assertEqual(str(expected), response["text"])
+
+    def test_server_errors(self):
+        """Invalid requests are answered with an error"""
+        for request in (
+            {"data": [(5, 6), (8, 10)], "num_permutations": 0},
+            {"data": [(5, 6), (8, 10)], "num_jobs": 4},
+            {"test": "anova", "data": [(5, 6), (8, 10)]},
+            {"data": [(5, 6), (8, 10)], "mct": "mode"},
+        ):
+            with self.assertRaises(RuntimeError):
+                request_test(self.socket, request)
+        # The server decides on the number of jobs
+        response = run_request({"data": [(5, 6), (8, 10)], "num_jobs": 4})
+        self.assertIn("num_jobs", response["error"])
+
+    def test_server_cli(self):
+        """Test CLI: randtest-mean and randtest-tmean in client mode"""
+        for cmd in (
+            "randtest-mean -p -1 ../data/group_A.dat ../data/group_B.dat",
+            "randtest-tmean -p 1000 -s 0 "
+            + "../data/smart_drug_data_treatment_group.dat "
+            + "../data/smart_drug_data_placebo_group.dat",
+        ):
+            local, client = [
+                subprocess.run(
+                    shlex.split(cmd + option), stdout=subprocess.PIPE
+                ).stdout
+                for option in ("", " --server {}".format(self.socket))
+            ]
+            self.assertEqual(local, client)
+            self.assertTrue(client.startswith(b"<class"))
+
+    def test_server_cli_local_options(self):
+        """Test CLI: options of local runs are rejected in client mode"""
+        for option in ("-n 2", "-b threads", "-l info"):
+            cmd = "randtest-paired {} --server {} {} {}".format(
+                option,
+                self.socket,
+                "../data/group_A.dat",
+                "../data/group_B.dat",
+            )
+            result = subprocess.run(
+                shlex.split(cmd),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            self.assertEqual(2, result.returncode)
+            self.assertIn(b"not allowed with argument --server", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
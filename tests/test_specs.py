@@ -0,0 +1,107 @@
+"""
+Unit tests for statistic specifications
+"""
+
+import pickle
+import subprocess
+import sys
+import unittest
+from statistics import median
+from randtest import randtest, randtest_paired, StatisticSpec
+from randtest.base import RandTest, worker_method
+from randtest.mcts import trimmed_mean
+from randtest.specs import SUM_BASED, ANTISYMMETRIC
+
+
+class TestStatisticSpec(unittest.TestCase):
+    """Unittesting StatisticSpec and the registry"""
+
+    def test_spec_capabilities(self):
+        """Registered statistics declare their capabilities"""
+        self.assertIn(SUM_BASED, StatisticSpec("mean").capabilities)
+        self.assertIn(ANTISYMMETRIC, StatisticSpec("difference").capabilities)
+        self.assertEqual(frozenset(), StatisticSpec("median").capabilities)
+        spec = StatisticSpec("trimmed_mean", trim_percent=0.1)
+        self.assertEqual(spec, pickle.loads(pickle.dumps(spec)))
+        self.assertEqual(
+            trimmed_mean(iter((1, 2, 3, 40)), 0.1), spec(iter((1, 2, 3, 40)))
+        )
+
+    def test_randtest_spec(self):
+        """Specifications and names give the same result as functions"""
+        group_a = (5.1, 6.3, 9.0, 3.2, 7.7, 2.5, 4.4)
+        group_b = (8.4, 10.0, 4.6, 6.8, 9.9, 1.2)
+        for mct, spec in (
+            (median, "median"),
+            (median, StatisticSpec("median")),
+            (trimmed_mean, StatisticSpec("trimmed_mean", trim_percent=0.2)),
+        ):
+            results = [
+                randtest(group_a, group_b, mct=m, num_permutations=-1)
+                for m in (mct, spec)
+            ]
+            self.assertEqual(
+                results[0].num_successes, results[1].num_successes
+            )
+            self.assertEqual(results[0].statistic, results[1].statistic)
+        rtest = RandTest(
+            group_a,
+            group_b,
+            StatisticSpec("mean"),
+            StatisticSpec("difference"),
+            -1,
+            "two_sided",
+            1,
+            None,
+        )
+        self.assertTrue(rtest.sum_based)
+
+    def test_randtest_lambda_threads(self):
+        """Lambdas work with the thread pool backend"""
+        test_result = randtest_paired(
+            (5, 6, 7),
+            (4, 6, 5),
+            mct=lambda data: sum(data),
+            num_permutations=-1,
+            backend="threads",
+        )
+        self.assertEqual(4, test_result.num_successes)
+        self.assertEqual(8, test_result.num_permutations)
+
+    def test_worker_method_payload(self):
+        """Tasks do not carry the randomization test"""
+        rtest = RandTest(
+            tuple(range(500)),
+            tuple(range(500)),
+            median,
+            StatisticSpec("difference"),
+            -1,
+            "two_sided",
+            1,
+            None,
+        )
+        self.assertLess(
+            len(pickle.dumps(worker_method("compute_block"))), 200
+        )
+        self.assertGreater(len(pickle.dumps(rtest.compute_block)), 2000)
+
+    def test_randtest_spawn(self):
+        """Specifications work with the 'spawn' start method"""
+        code = (
+            "import multiprocessing as mp\n"
+            + "from randtest import randtest, StatisticSpec\n"
+            + "if __name__ == '__main__':\n"
+            + "    mp.set_start_method('spawn')\n"
+            + "    result = randtest((5, 6), (8, 10), num_permutations=-1,\n"
+            + "        mct=StatisticSpec('trimmed_mean', trim_percent=0.0),\n"
+            + "        num_jobs=-1)\n"
+            + "    print(result.num_successes, result.num_permutations)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], stdout=subprocess.PIPE
+        )
+        self.assertEqual("2 6\n", result.stdout.decode("ascii"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Unit tests for the tail approximation of small p values
+"""
+
+import random
+import unittest
+from randtest import randtest
+from randtest.tail import fit_gpd, gpd_survival
+
+
+class TestTailApproximation(unittest.TestCase):
+    """Unittesting randtest(..., tail_approximation=True)"""
+
+    def test_fit_gpd_exponential(self):
+        """Exponential exceedances: shape close to 0, scale close to 1"""
+        rng = random.Random(0)
+        exceedances = [rng.expovariate(1.0) for _ in range(5000)]
+        shape, scale = fit_gpd(exceedances)
+        self.assertAlmostEqual(0.0, shape, delta=0.05)
+        self.assertAlmostEqual(1.0, scale, delta=0.05)
+        self.assertAlmostEqual(0.5, gpd_survival(0.693147, 0.0, 1.0), 5)
+
+    def test_tail_approximation_fallback(self):
+        """Enough exceedances: the empirical p value is reported"""
+        test_result = randtest(
+            (5, 6, 9, 3, 7),
+            (8, 10, 4, 6, 9),
+            num_permutations=2000,
+            seed=0,
+            tail_approximation=True,
+        )
+        self.assertEqual(test_result.p_value, test_result.p_value_approx)
+        self.assertGreater(test_result.p_value_approx_se, 0)
+
+    def test_tail_approximation_small_p_value(self):
+        """Few exceedances: the p value is extrapolated beyond 1 / N"""
+        rng = random.Random(3)
+        group_a = tuple(round(rng.gauss(1.3, 1), 3) for _ in range(30))
+        group_b = tuple(round(rng.gauss(0.0, 1), 3) for _ in range(30))
+        test_result = randtest(
+            group_a,
+            group_b,
+            num_permutations=2000,
+            num_jobs=-1,
+            seed=1,
+            tail_approximation=True,
+        )
+        self.assertEqual(1, test_result.num_successes)
+        self.assertGreater(test_result.p_value_approx, 0)
+        self.assertLess(test_result.p_value_approx, 1e-4)
+        self.assertIn("p value (tail approximation) = ", str(test_result))
+
+    def test_tail_approximation_off(self):
+        """By default, no tail approximation is reported"""
+        test_result = randtest((5, 6), (8, 10), num_permutations=-1)
+        self.assertIsNone(test_result.p_value_approx)
+        self.assertNotIn("tail approximation", str(test_result))
+
+
+if __name__ == "__main__":
+    unittest.main()